@@ -18,7 +18,6 @@ from dotenv import load_dotenv
 from openai import OpenAI
 from mem0 import Memory
 from qdrant_client import QdrantClient
-import phonenumbers
 from pydantic import BaseModel, Field, ValidationError
 
 # Load environment variables
@@ -33,6 +32,10 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
 QDRANT_USE_HTTPS = os.getenv("QDRANT_USE_HTTPS", "false").lower() == "true"
 
+# Deletes the separators allowed in phone numbers, in one C-level pass via
+# str.translate, before validation and user IDs
+PHONE_SEPARATORS = str.maketrans("", "", "+- ()")
+
 # System prompt for the AI tutor
 SYSTEM_PROMPT = """You are an expert AI Prompt Engineering Tutor specializing in the healthcare domain. Your mission is to teach healthcare professionals, AI developers, and health coaches how to craft high-quality, effective prompts for AI health coaching applications.
 
@@ -63,7 +66,7 @@ class UserIdentification(BaseModel):
     
     def model_post_init(self, __context):
         # Create unique identifier
-        clean_phone = self.phone_number.replace('+', '').replace('-', '').replace(' ', '').replace('(', '').replace(')', '')
+        clean_phone = self.phone_number.translate(PHONE_SEPARATORS)
         self.user_id = f"{self.username}_{clean_phone}"
 
 # Global variables for services
@@ -118,28 +121,9 @@ def initialize_services():
 
 def validate_phone_number(phone: str) -> bool:
     """Validate phone number format."""
-    try:
-        # Clean the phone number
-        clean_phone = phone.replace('+', '').replace('-', '').replace(' ', '').replace('(', '').replace(')', '')
-        
-        # Basic validation - should be at least 10 digits
-        if len(clean_phone) < 10 or not clean_phone.isdigit():
-            return False
-            
-        # Accept if it's 10+ digits (more lenient for testing)
-        if len(clean_phone) >= 10:
-            return True
-            
-        # Try to parse with phonenumbers library as fallback
-        try:
-            parsed = phonenumbers.parse(f"+{clean_phone}", None)
-            return phonenumbers.is_valid_number(parsed)
-        except:
-            # If parsing fails, reject
-            return False
-            
-    except Exception:
-        return False
+    # At least 10 digits once separators are removed (lenient for testing)
+    clean_phone = phone.translate(PHONE_SEPARATORS)
+    return len(clean_phone) >= 10 and clean_phone.isdigit()
 
 def create_user_session(username: str, phone: str) -> Tuple[str, str]:
     """Create or validate user session."""
@@ -4,11 +4,14 @@ Converted from Streamlit to Gradio with same functionality and 3 demo users.
 """
 
 import gradio as gr
+import functools
 import os
 import sys
+import time
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict, Any, Union
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 import json
 
@@ -19,7 +22,8 @@ from dotenv import load_dotenv
 from openai import OpenAI
 from mem0 import Memory
 from qdrant_client import QdrantClient
-from pydantic import BaseModel, Field, ValidationError
+
+from app_models import DEMO_USERS, UserHealth
 
 # Load environment variables from parent directory
 load_dotenv(Path(__file__).parent.parent / ".env")
@@ -32,43 +36,46 @@ logger = logging.getLogger(__name__)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
 QDRANT_USE_HTTPS = os.getenv("QDRANT_USE_HTTPS", "false").lower() == "true"
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
 
-# Demo Users Configuration
-DEMO_USERS = {
-    "john": {
-        "name": "John Smith",
-        "email": "john@healthcoach.ai",
-        "user_id": "john_demo_user"
-    },
-    "jane": {
-        "name": "Jane Doe", 
-        "email": "jane@healthcoach.ai",
-        "user_id": "jane_demo_user"
-    },
-    "jarvis": {
-        "name": "Jarvis Wilson",
-        "email": "jarvis@healthcoach.ai", 
-        "user_id": "jarvis_demo_user"
-    }
-}
-
-# Data Models
-class UserHealth(BaseModel):
-    """User health profile data model."""
-    peptide_usage: Optional[bool] = Field(default=None, description="Whether user uses peptides")
-    bpc157_usage: Optional[bool] = Field(default=None, description="Whether user uses BPC-157")
-    bpc157_dosage: Optional[str] = Field(default=None, description="BPC-157 dosage")
-    bpc157_duration: Optional[str] = Field(default=None, description="Duration of BPC-157 use")
-    health_goals: List[str] = Field(default_factory=list, description="User's health goals")
-    medical_conditions: List[str] = Field(default_factory=list, description="User's medical conditions")
-    current_medications: List[str] = Field(default_factory=list, description="User's current medications")
-    onboarding_completed: bool = Field(default=False, description="Whether onboarding is completed")
-    onboarding_date: Optional[datetime] = Field(default=None, description="Date of onboarding completion")
+# Coach instructions that open every system prompt
+BASE_INSTRUCTIONS = (
+    "You are a knowledgeable AI health coach specializing in peptide therapy. "
+    "You provide evidence-based information while emphasizing that peptides like BPC-157 "
+    "are not FDA-approved for human use and should only be used under medical supervision. "
+    "Always prioritize safety and recommend consulting healthcare professionals. "
+    "Use the provided conversation history and health profile to give personalized responses."
+)
 
 # Global variables for services
 memory_service = None
 openai_client = None
 user_profiles = {}  # Store user profiles in memory
+profile_contexts: Dict[str, str] = {}  # System-prompt context rendered from each profile
+
+# The chatbot shows only the most recent messages; the full conversation lives
+# in Mem0, and every streamed chunk re-sends the visible history to the browser
+MAX_VISIBLE_MESSAGES = 40
+
+# Minimum seconds between streamed chatbot updates; tokens arriving faster are
+# batched into the next update instead of each triggering a re-render
+STREAM_UPDATE_INTERVAL = 0.05
+
+# Short questions get a smaller completion budget, and questions about dosing
+# or contraindications a lower temperature so safety guidance stays consistent
+SHORT_MESSAGE_LENGTH = 80
+SHORT_RESPONSE_MAX_TOKENS = 400
+RESPONSE_MAX_TOKENS = 1000
+SAFETY_KEYWORDS = ("dosage", "contraindication")
+
+# Mem0 searches and writes run on this pool so a chat response can finish
+# streaming without waiting for its conversation to be stored
+memory_executor = ThreadPoolExecutor(max_workers=4)
+pending_memory_writes: Dict[str, Future] = {}
+
+# Bumped whenever a user's memories change, so cached searches go stale
+memory_versions: Dict[str, int] = {}
 
 def initialize_services():
     """Initialize Mem0 and OpenAI services."""
@@ -78,13 +85,15 @@ def initialize_services():
         # Initialize OpenAI client
         openai_client = OpenAI(api_key=OPENAI_API_KEY)
         
-        # Create Qdrant client
+        # Create Qdrant client; gRPC multiplexes every search and write over
+        # one long-lived HTTP/2 channel but needs the gRPC port to be reachable
         protocol = "https" if QDRANT_USE_HTTPS else "http"
         qdrant_client = QdrantClient(
             url=f"{protocol}://{QDRANT_URL}",
             port=None,
-            timeout=30,
-            prefer_grpc=False
+            grpc_port=QDRANT_GRPC_PORT,
+            timeout=10,
+            prefer_grpc=QDRANT_PREFER_GRPC
         )
         
         # Generate unique collection name with timestamp
@@ -113,6 +122,14 @@ def initialize_services():
         }
         
         memory_service = Memory.from_config(mem0_config)
+        
+        # Embeddings are deterministic for a given text, so repeated questions
+        # and facts reuse the vector instead of making another OpenAI call;
+        # each cached 1536-dim vector is a list of Python floats (~50 KB), so
+        # the cache is kept to a few hundred entries
+        memory_service.embedding_model.embed = functools.lru_cache(maxsize=256)(
+            memory_service.embedding_model.embed
+        )
         logger.info(f"Services initialized successfully with collection: {collection_name}")
         return True
         
@@ -123,25 +140,16 @@ def initialize_services():
 def save_health_profile_to_memory(user_id: str, profile: UserHealth):
     """Save health profile to Mem0 for persistence."""
     try:
-        profile_data = {
-            "type": "health_profile",
-            "peptide_usage": profile.peptide_usage,
-            "bpc157_usage": profile.bpc157_usage,
-            "bpc157_dosage": profile.bpc157_dosage,
-            "bpc157_duration": profile.bpc157_duration,
-            "health_goals": profile.health_goals,
-            "medical_conditions": profile.medical_conditions,
-            "current_medications": profile.current_medications,
-            "onboarding_completed": profile.onboarding_completed,
-            "onboarding_date": profile.onboarding_date.isoformat() if profile.onboarding_date else None
-        }
+        # mode="json" serializes onboarding_date as an ISO string in one pass
+        profile_data = {"type": "health_profile", **profile.model_dump(mode="json")}
         
         # Store as a memory with specific metadata
-        memory_service.add(
+        add_result = memory_service.add(
             f"User health profile: {json.dumps(profile_data)}",
             user_id=user_id,
             metadata={"type": "health_profile"}
         )
+        record_memory_changes(user_id, add_result)
         logger.info(f"Health profile saved to memory for user {user_id}")
     except Exception as e:
         logger.error(f"Failed to save health profile to memory: {str(e)}")
@@ -202,9 +210,16 @@ def get_user_profile(user_id: str) -> UserHealth:
             user_profiles[user_id] = UserHealth()
     return user_profiles[user_id]
 
+def get_profile_context(user_id: str) -> str:
+    """Get the system-prompt context for the user's health profile."""
+    if user_id not in profile_contexts:
+        profile_contexts[user_id] = get_user_profile(user_id).prompt_context()
+    return profile_contexts[user_id]
+
 def save_user_profile(user_id: str, profile: UserHealth):
     """Save user health profile to both memory and Mem0."""
     user_profiles[user_id] = profile
+    profile_contexts[user_id] = profile.prompt_context()
     # Also save to Mem0 for persistence
     save_health_profile_to_memory(user_id, profile)
 
@@ -231,54 +246,56 @@ def create_user_session(selected_user: str) -> Tuple[str, str, str, str]:
     
     return user_id, user_name, user_email, status_msg
 
-def generate_ai_response_stream(user_id: str, user_message: str, health_profile: UserHealth):
+@functools.lru_cache(maxsize=256)
+def _cached_search(user_id: str, query: str, version: int) -> Tuple[str, ...]:
+    """Search a user's memories; repeats are served until their memories change."""
+    results = memory_service.search(query=query, user_id=user_id, limit=5)
+    return tuple(entry["memory"] for entry in results.get("results", []))
+
+def search_memories(user_id: str, query: str) -> Tuple[str, ...]:
+    """Return the texts of the user's memories most relevant to the query."""
+    return _cached_search(user_id, query, memory_versions.get(user_id, 0))
+
+def record_memory_changes(user_id: str, add_result: Optional[Dict[str, Any]]):
+    """Invalidate the user's cached searches if a Mem0 add changed any memory."""
+    # Mem0 lists an ADD/UPDATE/DELETE event per memory it changed; turns that
+    # yield no new facts leave the cached searches valid
+    if any(entry.get("event", "NONE") != "NONE" for entry in (add_result or {}).get("results", [])):
+        memory_versions[user_id] = memory_versions.get(user_id, 0) + 1
+
+def store_conversation(conversation_messages: List[Dict[str, str]], user_id: str):
+    """Store a finished conversation turn in Mem0."""
+    try:
+        record_memory_changes(user_id, memory_service.add(conversation_messages, user_id=user_id))
+    except Exception as e:
+        # A failed add may still have changed some memories
+        memory_versions[user_id] = memory_versions.get(user_id, 0) + 1
+        logger.error(f"Error storing conversation: {str(e)}")
+
+def wait_for_pending_write(user_id: str):
+    """Block until the user's previous conversation turn has been stored."""
+    future = pending_memory_writes.pop(user_id, None)
+    if future is not None:
+        future.result()
+
+def generate_ai_response_stream(user_id: str, user_message: str):
     """Generate streaming AI response using Mem0 memory context and health profile."""
     try:
-        # Search for relevant memories
-        relevant_memories = memory_service.search(
-            query=user_message,
-            user_id=user_id,
-            limit=5
-        )
+        # Search for relevant memories in the background while the profile
+        # context is looked up; the previous turn must be stored first
+        wait_for_pending_write(user_id)
+        search_future = memory_executor.submit(search_memories, user_id, user_message)
         
-        memories_list = relevant_memories.get("results", [])
-        memories_str = "\n".join(f"- {entry['memory']}" for entry in memories_list)
-        
-        # Create health profile context
-        profile_context = ""
-        if health_profile.onboarding_completed:
-            profile_parts = []
-            if health_profile.peptide_usage:
-                profile_parts.append("User uses peptides")
-            if health_profile.bpc157_usage:
-                profile_parts.append(f"User uses BPC-157")
-                if health_profile.bpc157_dosage:
-                    profile_parts.append(f"BPC-157 dosage: {health_profile.bpc157_dosage}")
-                if health_profile.bpc157_duration:
-                    profile_parts.append(f"BPC-157 duration: {health_profile.bpc157_duration}")
-            if health_profile.health_goals:
-                profile_parts.append(f"Health goals: {', '.join(health_profile.health_goals)}")
-            if health_profile.medical_conditions:
-                profile_parts.append(f"Medical conditions: {', '.join(health_profile.medical_conditions)}")
-            if health_profile.current_medications:
-                profile_parts.append(f"Current medications: {', '.join(health_profile.current_medications)}")
-            
-            if profile_parts:
-                profile_context = f"\n\nUser Health Profile:\n" + "\n".join(f"- {part}" for part in profile_parts)
-        else:
-            profile_context = "\n\nNote: User hasn't completed their health profile yet. Provide general information and encourage them to complete their profile for personalized advice."
-        
-        # Construct system prompt
-        system_prompt = (
-            "You are a knowledgeable AI health coach specializing in peptide therapy. "
-            "You provide evidence-based information while emphasizing that peptides like BPC-157 "
-            "are not FDA-approved for human use and should only be used under medical supervision. "
-            "Always prioritize safety and recommend consulting healthcare professionals. "
-            "Use the provided conversation history and health profile to give personalized responses."
-            f"{profile_context}"
-            f"\n\nRelevant conversation history:\n{memories_str}" if memories_str 
-            else f"{profile_context}"
-        )
+        # Health profile context is rendered when the profile is saved
+        profile_context = get_profile_context(user_id)
+        
+        memories_str = "\n".join(f"- {memory}" for memory in search_future.result())
+        
+        # Construct system prompt; the coach instructions are always included
+        prompt_parts = [BASE_INSTRUCTIONS, profile_context]
+        if memories_str:
+            prompt_parts.append(f"\n\nRelevant conversation history:\n{memories_str}")
+        system_prompt = "".join(prompt_parts)
         
         messages = [
             {"role": "system", "content": system_prompt},
@@ -288,12 +305,17 @@ def generate_ai_response_stream(user_id: str, user_message: str, health_profile:
         # Initialize response accumulator
         assistant_response = ""
         
+        max_tokens = SHORT_RESPONSE_MAX_TOKENS if len(user_message) < SHORT_MESSAGE_LENGTH else RESPONSE_MAX_TOKENS
+        lowered_message = user_message.lower()
+        temperature = 0.2 if any(keyword in lowered_message for keyword in SAFETY_KEYWORDS) else 0.7
+        
         # Stream the response from OpenAI
         stream = openai_client.chat.completions.create(
             model="gpt-4o-mini",
             messages=messages,
-            temperature=0.7,
-            max_tokens=1000,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            n=1,
             stream=True
         )
         
@@ -304,12 +326,16 @@ def generate_ai_response_stream(user_id: str, user_message: str, health_profile:
                 assistant_response += chunk_content
                 yield chunk_content, assistant_response
         
-        # Store conversation in memory after streaming completes
-        try:
-            conversation_messages = messages + [{"role": "assistant", "content": assistant_response}]
-            memory_service.add(conversation_messages, user_id=user_id)
-        except Exception as e:
-            logger.error(f"Error storing conversation: {str(e)}")
+        # Store the new exchange in memory after streaming completes, without
+        # holding the response open until Mem0 has finished. The system prompt
+        # is left out: it only repeats instructions and already-stored memories.
+        conversation_messages = [
+            {"role": "user", "content": user_message},
+            {"role": "assistant", "content": assistant_response}
+        ]
+        pending_memory_writes[user_id] = memory_executor.submit(
+            store_conversation, conversation_messages, user_id
+        )
         
     except Exception as e:
         logger.error(f"Error generating AI response: {str(e)}")
@@ -327,11 +353,9 @@ def chat_with_coach(message: str, history: List[Dict], user_id: str):
         yield "", history
         return
     
-    # Get user health profile
-    health_profile = get_user_profile(user_id)
-    
-    # Add user message to history immediately
-    new_history = history + [{"role": "user", "content": message}]
+    # Add user message to history immediately, dropping the oldest messages
+    # beyond the visible window
+    new_history = history[-(MAX_VISIBLE_MESSAGES - 2):] + [{"role": "user", "content": message}]
     yield "", new_history
     
     # Add empty assistant message that we'll stream into
@@ -339,10 +363,17 @@ def chat_with_coach(message: str, history: List[Dict], user_id: str):
     
     # Stream the AI response
     try:
-        for chunk_content, full_response in generate_ai_response_stream(user_id, message, health_profile):
+        last_update = 0.0
+        for chunk_content, full_response in generate_ai_response_stream(user_id, message):
             # Update the last message in history with the accumulated response
             new_history[-1]["content"] = full_response
-            yield "", new_history
+            now = time.monotonic()
+            if now - last_update >= STREAM_UPDATE_INTERVAL:
+                last_update = now
+                yield "", new_history
+        
+        # Always send the final text, which may have been held back above
+        yield "", new_history
     except Exception as e:
         logger.error(f"Error in chat streaming: {str(e)}")
         error_response = f"I apologize, but I encountered an error: {str(e)}. Please try again."
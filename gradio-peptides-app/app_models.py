@@ -0,0 +1,67 @@
+"""
+Demo users and data models for the Health Coach AI Gradio app.
+Kept free of Gradio/OpenAI/Mem0 imports so tests can load them cheaply.
+"""
+
+from typing import List, Optional
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+# Demo Users Configuration
+DEMO_USERS = {
+    "john": {
+        "name": "John Smith",
+        "email": "john@healthcoach.ai",
+        "user_id": "john_demo_user"
+    },
+    "jane": {
+        "name": "Jane Doe", 
+        "email": "jane@healthcoach.ai",
+        "user_id": "jane_demo_user"
+    },
+    "jarvis": {
+        "name": "Jarvis Wilson",
+        "email": "jarvis@healthcoach.ai", 
+        "user_id": "jarvis_demo_user"
+    }
+}
+
+# Data Models
+class UserHealth(BaseModel):
+    """User health profile data model."""
+    peptide_usage: Optional[bool] = Field(default=None, description="Whether user uses peptides")
+    bpc157_usage: Optional[bool] = Field(default=None, description="Whether user uses BPC-157")
+    bpc157_dosage: Optional[str] = Field(default=None, description="BPC-157 dosage")
+    bpc157_duration: Optional[str] = Field(default=None, description="Duration of BPC-157 use")
+    health_goals: List[str] = Field(default_factory=list, description="User's health goals")
+    medical_conditions: List[str] = Field(default_factory=list, description="User's medical conditions")
+    current_medications: List[str] = Field(default_factory=list, description="User's current medications")
+    onboarding_completed: bool = Field(default=False, description="Whether onboarding is completed")
+    onboarding_date: Optional[datetime] = Field(default=None, description="Date of onboarding completion")
+    
+    def prompt_context(self) -> str:
+        """Render the profile as the context block appended to the coach's system prompt."""
+        if not self.onboarding_completed:
+            return "\n\nNote: User hasn't completed their health profile yet. Provide general information and encourage them to complete their profile for personalized advice."
+        
+        profile_parts = []
+        if self.peptide_usage:
+            profile_parts.append("User uses peptides")
+        if self.bpc157_usage:
+            profile_parts.append(f"User uses BPC-157")
+            if self.bpc157_dosage:
+                profile_parts.append(f"BPC-157 dosage: {self.bpc157_dosage}")
+            if self.bpc157_duration:
+                profile_parts.append(f"BPC-157 duration: {self.bpc157_duration}")
+        if self.health_goals:
+            profile_parts.append(f"Health goals: {', '.join(self.health_goals)}")
+        if self.medical_conditions:
+            profile_parts.append(f"Medical conditions: {', '.join(self.medical_conditions)}")
+        if self.current_medications:
+            profile_parts.append(f"Current medications: {', '.join(self.current_medications)}")
+        
+        if not profile_parts:
+            return ""
+        return f"\n\nUser Health Profile:\n" + "\n".join(f"- {part}" for part in profile_parts)
+
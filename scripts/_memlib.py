@@ -0,0 +1,124 @@
+"""
+Shared Mem0 + Qdrant setup for the demo and test scripts.
+
+Clients and Memory instances are built once per process and reused, so
+scripts that run in the same process (e.g. under pytest) share one Qdrant
+connection pool, one OpenAI client and one Mem0 bootstrap per collection.
+"""
+
+import functools
+import os
+
+from dotenv import load_dotenv
+from mem0 import Memory
+from openai import OpenAI
+from qdrant_client import QdrantClient, models
+
+# Load environment variables
+load_dotenv()
+
+# Read the settings once; missing keys are reported where they are validated
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+QDRANT_URL = os.getenv("QDRANT_URL")
+PROTOCOL = "https" if os.getenv("QDRANT_USE_HTTPS", "true").lower() == "true" else "http"
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+@functools.lru_cache(maxsize=1)
+def get_qdrant_client() -> QdrantClient:
+    """Return the process-wide Qdrant client."""
+    # Timeout suits the Railway deployment; gRPC is opt-in because it needs the
+    # Qdrant gRPC port to be reachable, which Railway does not expose by default
+    return QdrantClient(
+        url=f"{PROTOCOL}://{QDRANT_URL}",
+        port=None,
+        grpc_port=QDRANT_GRPC_PORT,
+        timeout=30,
+        prefer_grpc=QDRANT_PREFER_GRPC
+    )
+
+@functools.lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """Return the process-wide OpenAI client."""
+    return OpenAI()
+
+@functools.lru_cache(maxsize=None)
+def get_memory(collection_name: str, embedding_dims: int = 1536) -> Memory:
+    """
+    Return the Mem0 instance for a collection, creating it on first use.
+    
+    Args:
+        collection_name: Qdrant collection backing the memories
+        embedding_dims: Size of the text-embedding-3-small vectors to store
+    
+    Returns:
+        Memory configured with the shared Qdrant client
+    """
+    qdrant_client = get_qdrant_client()
+    
+    # Pre-create the collection with int8 scalar quantization: the quantized
+    # vectors stay in RAM for scoring and the originals on disk for rescoring.
+    # Mem0 reuses an existing collection as-is.
+    if not qdrant_client.collection_exists(collection_name):
+        qdrant_client.create_collection(
+            collection_name=collection_name,
+            vectors_config=models.VectorParams(size=embedding_dims, distance=models.Distance.COSINE, on_disk=True),
+            quantization_config=models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, always_ram=True)
+            )
+        )
+    
+    config = {
+        "llm": {
+            "provider": "openai",
+            "config": {
+                "model": "gpt-4o-mini",
+                "temperature": 0.7,
+                "max_tokens": 1000
+            }
+        },
+        "embedder": {
+            "provider": "openai",
+            "config": {
+                "model": EMBEDDING_MODEL,
+                "embedding_dims": embedding_dims
+            }
+        },
+        "vector_store": {
+            "provider": "qdrant",
+            "config": {
+                "collection_name": collection_name,
+                "client": qdrant_client,
+                "embedding_model_dims": embedding_dims,
+                "on_disk": False
+            }
+        }
+    }
+    memory = Memory.from_config(config)
+    
+    # Index user_id so per-user filters use the payload index; a failure here
+    # only costs filter speed, so it mustn't stop the Memory being returned
+    try:
+        qdrant_client.create_payload_index(
+            collection_name=collection_name,
+            field_name="user_id",
+            field_schema=models.PayloadSchemaType.KEYWORD
+        )
+    except Exception as e:
+        print(f"⚠️  Could not index user_id in {collection_name}: {str(e)}")
+    
+    # Page in the HNSW entry points now rather than on the first real search.
+    # A unit vector is used because cosine distance can't normalize zeros.
+    # Best-effort, like the index above: the first search just runs cold.
+    try:
+        qdrant_client.query_points(
+            collection_name=collection_name,
+            query=[1.0] + [0.0] * (embedding_dims - 1),
+            limit=1
+        )
+    except Exception:
+        pass
+    
+    return memory
@@ -16,14 +16,25 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import httpx
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import APITimeoutError, OpenAI
 from mem0 import Memory
 from qdrant_client import QdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException
+from qdrant_client.models import Distance, VectorParams
 
 # Load environment variables
 load_dotenv()
 
+# Minimum similarity for a memory to be included in the system prompt;
+# text-embedding-3-small cosine scores for relevant memories typically land
+# around 0.3-0.6, so the default only drops clearly unrelated hits
+MEMORY_SCORE_THRESHOLD = float(os.getenv("MEMORY_SCORE_THRESHOLD", "0.3"))
+
+# Transport failures worth retrying; anything else is a real error
+RETRYABLE_ERRORS = (httpx.TimeoutException, ResponseHandlingException, APITimeoutError)
+
 class DemoWrapper:
     """Wrapper class for demonstrating Mem0 + Qdrant functionality."""
     
@@ -52,13 +63,30 @@ class DemoWrapper:
         qdrant_use_https = os.getenv("QDRANT_USE_HTTPS", "true").lower() == "true"
         protocol = "https" if qdrant_use_https else "http"
         
+        # gRPC keeps a single long-lived (TLS) channel open for the whole session
+        # and sends vectors as packed protobuf floats rather than JSON text;
+        # opt-in because it needs the Qdrant gRPC port to be reachable
+        prefer_grpc = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+        grpc_port = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+        
         self.qdrant_client = QdrantClient(
             url=f"{protocol}://{qdrant_url}",
             port=None,
-            timeout=30,
-            prefer_grpc=False
+            grpc_port=grpc_port,
+            timeout=3,
+            prefer_grpc=prefer_grpc
         )
         
+        # Pre-create the collection with dot-product distance. OpenAI embeddings
+        # are unit-normalized, so this ranks exactly like cosine; Mem0 reuses an
+        # existing collection and would otherwise create it with cosine.
+        collection_name = "mem0_demo_wrapper"
+        if not self.qdrant_client.collection_exists(collection_name):
+            self.qdrant_client.create_collection(
+                collection_name=collection_name,
+                vectors_config=VectorParams(size=1536, distance=Distance.DOT, on_disk=False)
+            )
+        
         # Initialize Mem0 memory
         config = {
             "llm": {
@@ -72,7 +100,7 @@ class DemoWrapper:
             "vector_store": {
                 "provider": "qdrant",
                 "config": {
-                    "collection_name": "mem0_demo_wrapper",
+                    "collection_name": collection_name,
                     "client": self.qdrant_client,
                     "embedding_model_dims": 1536,
                     "on_disk": False
@@ -83,21 +111,43 @@ class DemoWrapper:
         self.memory = Memory.from_config(config)
         self.openai_client = OpenAI()
     
+    def _with_retry(self, func, *args, attempts: int = 2, **kwargs):
+        """Call a read-only memory operation, retrying timeouts and transport
+        errors after a short back-off so a slow Qdrant request fails fast
+        instead of freezing the session."""
+        for attempt in range(1, attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except RETRYABLE_ERRORS:
+                if attempt == attempts:
+                    raise
+                time.sleep(0.1 * attempt)
+    
     def generate_response(self, user_message: str) -> str:
         """Generate AI response with memory context."""
         print(f"🔍 Searching memories for: '{user_message[:30]}...'")
         
-        # Search for relevant memories
-        relevant_memories = self.memory.search(
+        # Search for relevant memories; low-scoring hits (e.g. small talk) are
+        # dropped so they don't bloat the system prompt. The pinned mem0 has no
+        # threshold parameter on search, so the cut-off is applied here.
+        relevant_memories = self._with_retry(
+            self.memory.search,
             query=user_message,
             user_id=self.user_id,
-            limit=5
+            limit=3
         )
         
-        memories_list = relevant_memories.get("results", [])
-        memories_str = "\n".join(f"- {entry['memory']}" for entry in memories_list)
+        all_memories = relevant_memories.get("results", [])
+        memories_list = [
+            entry for entry in all_memories
+            if entry.get("score", 0) >= MEMORY_SCORE_THRESHOLD
+        ]
+        memories_str = "\n".join(["- " + entry["memory"] for entry in memories_list])
         
         print(f"📚 Found {len(memories_list)} relevant memories")
+        filtered_count = len(all_memories) - len(memories_list)
+        if filtered_count:
+            print(f"🔽 Skipped {filtered_count} memories scoring below {MEMORY_SCORE_THRESHOLD}")
         
         # Construct system prompt
         system_prompt = (
@@ -129,6 +179,8 @@ class DemoWrapper:
         # Store conversation in memory
         print("💾 Storing conversation in memory...")
         conversation_messages = messages + [{"role": "assistant", "content": assistant_response}]
+        # Not retried: add isn't idempotent, and a timeout after the server
+        # committed the write would store the memories twice
         self.memory.add(conversation_messages, user_id=self.user_id)
         
         self.conversation_count += 1
@@ -162,7 +214,7 @@ class DemoWrapper:
         """Search memories for a specific query."""
         print(f"\n🔍 Searching memories for: '{query}'")
         
-        results = self.memory.search(query=query, user_id=self.user_id, limit=10)
+        results = self._with_retry(self.memory.search, query=query, user_id=self.user_id, limit=10)
         memories = results.get("results", [])
         
         if memories:
@@ -175,7 +227,7 @@ class DemoWrapper:
     def show_stats(self):
         """Show session statistics."""
         try:
-            all_memories = self.memory.search(query="user", user_id=self.user_id, limit=100)
+            all_memories = self._with_retry(self.memory.search, query="user", user_id=self.user_id, limit=100)
             memory_count = len(all_memories.get("results", []))
             
             duration = time.time() - self.start_time
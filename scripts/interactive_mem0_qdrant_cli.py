@@ -21,26 +21,65 @@ Author: AI Tutor Development Team
 Version: 1.0
 """
 
+import copy
+import hashlib
 import os
+import secrets
+import sqlite3
 import sys
 import time
-import uuid
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
-
-# Add the project root to the Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+from types import SimpleNamespace
 
 from dotenv import load_dotenv
-from openai import OpenAI
-from mem0 import Memory
-from qdrant_client import QdrantClient
+
+# openai, mem0 and qdrant_client are imported inside the _initialize_* methods
+# so --help and early error exits don't pay for loading them
+if TYPE_CHECKING:
+    from qdrant_client import models
 
 # Load environment variables
 load_dotenv()
 
+# Qdrant collection backing the demo, and the embedder Mem0 uses by default
+COLLECTION_NAME = "mem0_interactive_demo"
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Mem0 configuration; the Qdrant client is injected per instance
+_MEM0_CONFIG_TEMPLATE = {
+    "llm": {
+        "provider": "openai",
+        "config": {
+            "model": "gpt-4o-mini",
+            "temperature": 0.7,
+            "max_tokens": 1000
+        }
+    },
+    "vector_store": {
+        "provider": "qdrant",
+        "config": {
+            "collection_name": COLLECTION_NAME,
+            "embedding_model_dims": 1536,
+            "on_disk": False
+        }
+    }
+}
+
+# Keep idle HTTP/2 connections to OpenAI and Qdrant open between prompts so
+# a pause in the conversation doesn't cost a fresh TLS handshake
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 8
+HTTP_KEEPALIVE_EXPIRY = 120.0
+
+# Query embeddings persist here across sessions so repeated prompts skip the API;
+# beyond the row cap, the least recently used vectors (~6 KB each) are pruned
+EMBEDDING_CACHE_PATH = Path.home() / ".cache" / "mem0_cli_embeddings.sqlite3"
+EMBEDDING_CACHE_MAX_ROWS = 5000
+
 class Colors:
     """ANSI color codes for terminal output."""
     HEADER = '\033[95m'
@@ -53,6 +92,13 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+# Prebuilt prefixes for the most frequent success/failure status lines
+_P = SimpleNamespace(
+    ok=f"{Colors.OKGREEN}✅",
+    err=f"{Colors.FAIL}❌",
+    end=Colors.ENDC,
+)
+
 class InteractiveMem0CLI:
     """
     Interactive CLI for Mem0 + Qdrant demonstrations.
@@ -61,6 +107,10 @@ class InteractiveMem0CLI:
     Mem0's memory capabilities with persistent Qdrant storage.
     """
     
+    # Memory search results are reused for identical queries within this window
+    SEARCH_CACHE_TTL = 30.0
+    SEARCH_CACHE_MAXSIZE = 256
+    
     def __init__(self, user_id: Optional[str] = None):
         """
         Initialize the interactive CLI.
@@ -68,9 +118,15 @@ class InteractiveMem0CLI:
         Args:
             user_id: Optional user ID. If not provided, a unique one will be generated.
         """
-        self.user_id = user_id or f"demo_user_{uuid.uuid4().hex[:8]}"
+        self.user_id = user_id or f"demo_user_{secrets.token_hex(4)}"
         self.conversation_count = 0
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
+        self._search_cache: Dict[tuple, tuple] = {}
+        
+        # Mem0 writes run in the background while the user reads the reply;
+        # the pending write is awaited before anything reads memory again
+        self._store_pool = ThreadPoolExecutor(max_workers=1)
+        self._pending_store: Optional[Future] = None
         
         print(f"{Colors.HEADER}🧠 Initializing Interactive Mem0 + Qdrant CLI Demo{Colors.ENDC}")
         print(f"{Colors.OKBLUE}User ID: {self.user_id}{Colors.ENDC}")
@@ -82,75 +138,184 @@ class InteractiveMem0CLI:
         self._initialize_qdrant_client()
         self._initialize_memory()
         self._initialize_openai_client()
+        self._initialize_embedding_cache()
         
-        print(f"{Colors.OKGREEN}✅ All components initialized successfully!{Colors.ENDC}")
+        print(f"{_P.ok} All components initialized successfully!{_P.end}")
     
     def _validate_environment(self) -> None:
         """Validate required environment variables."""
         print(f"{Colors.OKCYAN}🔍 Validating environment...{Colors.ENDC}")
         
         if not os.getenv("OPENAI_API_KEY"):
-            raise ValueError(f"{Colors.FAIL}❌ OPENAI_API_KEY not found in environment variables{Colors.ENDC}")
+            raise ValueError(f"{_P.err} OPENAI_API_KEY not found in environment variables{_P.end}")
         
         if not os.getenv("QDRANT_URL"):
-            raise ValueError(f"{Colors.FAIL}❌ QDRANT_URL not found in environment variables{Colors.ENDC}")
+            raise ValueError(f"{_P.err} QDRANT_URL not found in environment variables{_P.end}")
         
-        print(f"{Colors.OKGREEN}✅ Environment validation passed{Colors.ENDC}")
+        print(f"{_P.ok} Environment validation passed{_P.end}")
     
     def _initialize_qdrant_client(self) -> None:
         """Initialize Qdrant client with proper settings."""
         print(f"{Colors.OKCYAN}🔗 Connecting to Qdrant...{Colors.ENDC}")
         
+        import httpx
+        from qdrant_client import QdrantClient, models
+        
         qdrant_url = os.getenv("QDRANT_URL")
         qdrant_use_https = os.getenv("QDRANT_USE_HTTPS", "true").lower() == "true"
         protocol = "https" if qdrant_use_https else "http"
         
+        # gRPC (protobuf over one HTTP/2 channel) is opt-in because it needs the
+        # Qdrant gRPC port to be reachable, which Railway does not expose by default
+        prefer_grpc = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+        grpc_port = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+        
         self.qdrant_client = QdrantClient(
             url=f"{protocol}://{qdrant_url}",
             port=None,
+            grpc_port=grpc_port,
             timeout=30,
-            prefer_grpc=False
+            prefer_grpc=prefer_grpc,
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+        
+        # Search the int8-quantized vectors, then rescore 2x oversampled candidates
+        self._search_params = models.SearchParams(
+            quantization=models.QuantizationSearchParams(ignore=False, rescore=True, oversampling=2.0)
         )
         
         # Test connection
         try:
             collections = self.qdrant_client.get_collections()
-            print(f"{Colors.OKGREEN}✅ Connected to Qdrant: {len(collections.collections)} collections available{Colors.ENDC}")
+            print(f"{_P.ok} Connected to Qdrant: {len(collections.collections)} collections available{_P.end}")
         except Exception as e:
-            raise ConnectionError(f"{Colors.FAIL}❌ Failed to connect to Qdrant: {str(e)}{Colors.ENDC}")
+            raise ConnectionError(f"{_P.err} Failed to connect to Qdrant: {str(e)}{_P.end}")
     
     def _initialize_memory(self) -> None:
         """Initialize Mem0 memory with Qdrant backend."""
         print(f"{Colors.OKCYAN}🧠 Initializing Mem0 memory system...{Colors.ENDC}")
         
-        config = {
-            "llm": {
-                "provider": "openai",
-                "config": {
-                    "model": "gpt-4o-mini",
-                    "temperature": 0.7,
-                    "max_tokens": 1000
-                }
-            },
-            "vector_store": {
-                "provider": "qdrant",
-                "config": {
-                    "collection_name": "mem0_interactive_demo",
-                    "client": self.qdrant_client,
-                    "embedding_model_dims": 1536,
-                    "on_disk": False
-                }
-            }
-        }
+        from mem0 import Memory
+        from qdrant_client import models
+        
+        config = copy.deepcopy(_MEM0_CONFIG_TEMPLATE)
+        config["vector_store"]["config"]["client"] = self.qdrant_client
         
         self.memory = Memory.from_config(config)
-        print(f"{Colors.OKGREEN}✅ Mem0 memory system initialized{Colors.ENDC}")
+        
+        # Keep int8-quantized vectors in RAM for the HNSW compare stage; searches
+        # rescore the oversampled candidates against the original vectors. Only
+        # unquantized collections are updated, and, as with the index below, a
+        # failure only costs search speed
+        try:
+            collection_info = self.qdrant_client.get_collection(COLLECTION_NAME)
+            if collection_info.config.quantization_config is None:
+                self.qdrant_client.update_collection(
+                    collection_name=COLLECTION_NAME,
+                    quantization_config=models.ScalarQuantization(
+                        scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, always_ram=True)
+                    )
+                )
+        except Exception as e:
+            print(f"{Colors.WARNING}⚠️  Could not enable int8 quantization: {str(e)}{Colors.ENDC}")
+        
+        # Index user_id so per-user counts and filters use the payload index;
+        # re-creating an existing index is a no-op, and a failure here only
+        # costs filter speed, so it shouldn't stop the session
+        try:
+            self.qdrant_client.create_payload_index(
+                collection_name=COLLECTION_NAME,
+                field_name="user_id",
+                field_schema=models.PayloadSchemaType.KEYWORD
+            )
+        except Exception as e:
+            print(f"{Colors.WARNING}⚠️  Could not index user_id: {str(e)}{Colors.ENDC}")
+        print(f"{_P.ok} Mem0 memory system initialized{_P.end}")
     
     def _initialize_openai_client(self) -> None:
         """Initialize OpenAI client."""
         print(f"{Colors.OKCYAN}🤖 Initializing OpenAI client...{Colors.ENDC}")
-        self.openai_client = OpenAI()
-        print(f"{Colors.OKGREEN}✅ OpenAI client initialized{Colors.ENDC}")
+        import httpx
+        from openai import DefaultHttpxClient, OpenAI
+        
+        limits = httpx.Limits(
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+        self.openai_client = OpenAI(http_client=DefaultHttpxClient(http2=True, limits=limits))
+        print(f"{_P.ok} OpenAI client initialized{_P.end}")
+    
+    def _initialize_embedding_cache(self) -> None:
+        """Open the on-disk query embedding cache."""
+        EMBEDDING_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        self._embedding_cache = sqlite3.connect(EMBEDDING_CACHE_PATH)
+        with self._embedding_cache:
+            self._embedding_cache.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL DEFAULT 0)"
+            )
+            try:
+                # Caches written before pruning existed lack the column
+                self._embedding_cache.execute(
+                    "ALTER TABLE embeddings ADD COLUMN last_used REAL NOT NULL DEFAULT 0"
+                )
+            except sqlite3.OperationalError:
+                pass
+            self._embedding_cache.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+            )
+    
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed query texts, serving repeats from the on-disk cache.
+        
+        Vectors are stored as float32 bytes keyed by a BLAKE2b digest of the
+        model name and text; all cache misses are embedded in one request.
+        Newlines are replaced with spaces first, as Mem0's embedder does, so
+        query vectors match the ones its memories were stored with.
+        """
+        texts = [text.replace("\n", " ") for text in texts]
+        keys = [
+            hashlib.blake2b(f"{EMBEDDING_MODEL}\0{text}".encode(), digest_size=16).hexdigest()
+            for text in texts
+        ]
+        now = time.time()
+        vectors: List[Optional[List[float]]] = []
+        with self._embedding_cache:
+            for key in keys:
+                row = self._embedding_cache.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    self._embedding_cache.execute(
+                        "UPDATE embeddings SET last_used = ? WHERE key = ?", (now, key)
+                    )
+                vectors.append(array("f", row[0]).tolist() if row else None)
+        
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            response = self.openai_client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=[texts[i] for i in missing]
+            )
+            with self._embedding_cache:
+                for i, item in zip(missing, response.data):
+                    vectors[i] = item.embedding
+                    self._embedding_cache.execute(
+                        "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                        (keys[i], array("f", item.embedding).tobytes(), now)
+                    )
+                # Keep only the most recently used rows
+                self._embedding_cache.execute(
+                    "DELETE FROM embeddings WHERE key NOT IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used DESC LIMIT ?)",
+                    (EMBEDDING_CACHE_MAX_ROWS,)
+                )
+        return vectors
     
     def generate_ai_response(self, user_message: str) -> str:
         """
@@ -162,68 +327,113 @@ class InteractiveMem0CLI:
         Returns:
             AI assistant's response
         """
-        print(f"{Colors.OKCYAN}🔍 Searching for relevant memories...{Colors.ENDC}")
+        assistant_response, conversation_messages = self._respond(user_message)
         
-        # Search for relevant memories
-        relevant_memories = self.memory.search(
-            query=user_message,
-            user_id=self.user_id,
-            limit=5
+        # Store conversation in memory without blocking the next prompt
+        print(f"{Colors.OKCYAN}💾 Storing conversation in memory...{Colors.ENDC}")
+        self._pending_store = self._store_pool.submit(
+            self._store_conversation, conversation_messages, self.user_id
         )
         
-        memories_list = relevant_memories.get("results", [])
-        memories_str = "\n".join(f"- {entry['memory']}" for entry in memories_list)
+        return assistant_response
+    
+    def _respond(self, user_message: str) -> Tuple[str, List[Dict[str, str]]]:
+        """
+        Generate an AI response without persisting the exchange.
+        
+        Args:
+            user_message: User's input message
+            
+        Returns:
+            The assistant's response and the full conversation to store
+        """
+        print(f"{Colors.OKCYAN}🔍 Searching for relevant memories...{Colors.ENDC}")
+        
+        # Search for relevant memories
+        memories_list = self._cached_search(user_message, limit=5)
         
         print(f"{Colors.OKBLUE}📚 Found {len(memories_list)} relevant memories{Colors.ENDC}")
         
         # Construct system prompt with memory context
-        system_prompt = (
-            "You are a knowledgeable AI assistant with access to conversation history. "
-            "Use the provided memories to give contextual and personalized responses. "
-            "If the conversation involves health topics like peptides, always emphasize "
-            "the importance of medical supervision and that such substances may not be "
-            "FDA-approved for human use. Keep responses helpful but concise."
-            f"\n\nRelevant conversation history:\n{memories_str}" if memories_str 
-            else "You are a knowledgeable AI assistant."
-        )
+        if memories_list:
+            memories_str = "- " + "\n- ".join(list(map(itemgetter("memory"), memories_list)))
+            system_prompt = (
+                "You are a knowledgeable AI assistant with access to conversation history. "
+                "Use the provided memories to give contextual and personalized responses. "
+                "If the conversation involves health topics like peptides, always emphasize "
+                "the importance of medical supervision and that such substances may not be "
+                "FDA-approved for human use. Keep responses helpful but concise."
+                f"\n\nRelevant conversation history:\n{memories_str}"
+            )
+        else:
+            system_prompt = "You are a knowledgeable AI assistant."
         
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_message}
         ]
         
-        # Generate response
+        # Generate response, streaming tokens to the terminal as they arrive
         print(f"{Colors.OKCYAN}🤖 Generating AI response...{Colors.ENDC}")
-        response = self.openai_client.chat.completions.create(
+        stream = self.openai_client.chat.completions.create(
             model="gpt-4o-mini",
             messages=messages,
             temperature=0.7,
-            max_tokens=1000
+            max_tokens=1000,
+            stream=True
         )
         
-        assistant_response = response.choices[0].message.content
-        
-        # Store conversation in memory
-        print(f"{Colors.OKCYAN}💾 Storing conversation in memory...{Colors.ENDC}")
+        print(f"{Colors.BOLD}🤖 AI:{Colors.ENDC} ", end="", flush=True)
+        chunks = []
+        for event in stream:
+            if not event.choices:
+                continue
+            delta = event.choices[0].delta.content
+            if delta:
+                chunks.append(delta)
+                sys.stdout.write(delta)
+                sys.stdout.flush()
+        print()
+        
+        assistant_response = "".join(chunks)
         conversation_messages = messages + [{"role": "assistant", "content": assistant_response}]
-        self.memory.add(conversation_messages, user_id=self.user_id)
-        
+        return assistant_response, conversation_messages
+    
+    def _store_conversation(self, conversation_messages: List[Dict[str, str]], user_id: str) -> None:
+        """Persist a conversation turn to Mem0 and invalidate cached searches."""
+        self.memory.add(conversation_messages, user_id=user_id)
+        self._search_cache.clear()
         self.conversation_count += 1
-        return assistant_response
+    
+    def _wait_for_pending_store(self) -> None:
+        """Block until the previous turn's memory write has finished."""
+        pending, self._pending_store = self._pending_store, None
+        if pending is None:
+            return
+        try:
+            pending.result()
+        except Exception as e:
+            print(f"{_P.err} Failed to store conversation: {str(e)}{_P.end}")
     
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get statistics about current memory usage."""
+        self._wait_for_pending_store()
         try:
-            # Search for memories using a broad term
-            all_memories = self.memory.search(query="user", user_id=self.user_id, limit=100)
-            memory_count = len(all_memories.get("results", []))
+            # Count the user's points via the payload index (no embedding or vector
+            # search); exact, since an estimate can be off for a filtered count
+            memory_count = self.qdrant_client.count(
+                collection_name=COLLECTION_NAME,
+                count_filter=self._user_filter(),
+                exact=True
+            ).count
+            uptime = time.monotonic() - self.start_time
             
             return {
                 "total_memories": memory_count,
                 "user_id": self.user_id,
                 "conversations": self.conversation_count,
-                "uptime_seconds": time.time() - self.start_time,
-                "uptime_formatted": self._format_duration(time.time() - self.start_time)
+                "uptime_seconds": uptime,
+                "uptime_formatted": self._format_duration(uptime)
             }
         except Exception as e:
             return {"error": str(e)}
@@ -237,24 +447,132 @@ class InteractiveMem0CLI:
         else:
             return f"{seconds/3600:.1f} hours"
     
+    def _user_filter(self) -> "models.Filter":
+        """Qdrant filter matching the current user's memories."""
+        from qdrant_client import models
+        return models.Filter(
+            must=[models.FieldCondition(key="user_id", match=models.MatchValue(value=self.user_id))]
+        )
+    
+    def _search_many(self, queries: List[Tuple[str, int]]) -> List[List[Dict[str, Any]]]:
+        """
+        Run several memory searches for the current user in one round-trip.
+        
+        Query texts are embedded through the embedding cache and searched
+        with a single Qdrant batch query. Results use Mem0's search result shape.
+        
+        Args:
+            queries: (query, limit) pairs
+            
+        Returns:
+            One result list per query, in the same order
+        """
+        from qdrant_client import models
+        
+        embeddings = self._embed([query for query, _ in queries])
+        user_filter = self._user_filter()
+        responses = self.qdrant_client.query_batch_points(
+            collection_name=COLLECTION_NAME,
+            requests=[
+                models.QueryRequest(
+                    query=embedding,
+                    filter=user_filter,
+                    limit=limit,
+                    params=self._search_params,
+                    with_payload=True
+                )
+                for embedding, (_, limit) in zip(embeddings, queries)
+            ]
+        )
+        return [
+            [
+                {
+                    "id": str(point.id),
+                    "memory": point.payload.get("data", ""),
+                    "hash": point.payload.get("hash"),
+                    "created_at": point.payload.get("created_at"),
+                    "updated_at": point.payload.get("updated_at"),
+                    "score": point.score,
+                    "user_id": point.payload.get("user_id"),
+                }
+                for point in response.points
+            ]
+            for response in responses
+        ]
+    
+    def _cached_search_many(self, queries: List[Tuple[str, int]]) -> List[List[Dict[str, Any]]]:
+        """
+        Search memories for the current user, reusing recent identical results.
+        
+        Results are keyed on (user_id, query, limit) and expire after
+        SEARCH_CACHE_TTL seconds. Broad searches (limit > 50) are not cached.
+        All cache misses are fetched together through _search_many.
+        """
+        self._wait_for_pending_store()
+        now = time.monotonic()
+        results: List[Optional[List[Dict[str, Any]]]] = []
+        misses = []
+        for query, limit in queries:
+            cached = self._search_cache.get((self.user_id, query, limit))
+            if cached is not None and now - cached[0] < self.SEARCH_CACHE_TTL:
+                results.append(cached[1])
+            else:
+                results.append(None)
+                misses.append((query, limit))
+        
+        if misses:
+            fetched = iter(self._search_many(misses))
+            for i, (query, limit) in enumerate(queries):
+                if results[i] is not None:
+                    continue
+                results[i] = next(fetched)
+                if limit > 50:
+                    continue
+                if len(self._search_cache) >= self.SEARCH_CACHE_MAXSIZE:
+                    # Evict the oldest entry (dicts preserve insertion order)
+                    del self._search_cache[next(iter(self._search_cache))]
+                self._search_cache[(self.user_id, query, limit)] = (now, results[i])
+        return results
+    
+    def _cached_search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Search memories for a single query through the result cache."""
+        return self._cached_search_many([(query, limit)])[0]
+    
     def search_memories(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search memories for a specific query."""
         try:
-            search_results = self.memory.search(
-                query=query, 
-                user_id=self.user_id, 
-                limit=limit
+            return self._cached_search(query, limit)
+        except Exception as e:
+            print(f"{_P.err} Memory search failed: {str(e)}{_P.end}")
+            return []
+    
+    def _list_memories(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Enumerate the current user's memories by scrolling the payload index.
+        
+        Unlike search_memories this needs no embedding or vector search.
+        """
+        self._wait_for_pending_store()
+        try:
+            points, _ = self.qdrant_client.scroll(
+                collection_name=COLLECTION_NAME,
+                scroll_filter=self._user_filter(),
+                limit=limit,
+                with_payload=True,
+                with_vectors=False
             )
-            return search_results.get("results", [])
+            return [{"id": str(point.id), "memory": point.payload.get("data", "")} for point in points]
         except Exception as e:
-            print(f"{Colors.FAIL}❌ Memory search failed: {str(e)}{Colors.ENDC}")
+            print(f"{_P.err} Listing memories failed: {str(e)}{_P.end}")
             return []
     
     def switch_user(self, new_user_id: str) -> None:
         """Switch to a different user ID."""
+        self._wait_for_pending_store()
         old_user = self.user_id
         self.user_id = new_user_id
-        print(f"{Colors.OKGREEN}✅ Switched from user '{old_user}' to '{self.user_id}'{Colors.ENDC}")
+        self._search_cache.clear()
+        print(f"{_P.ok} Switched from user '{old_user}' to '{self.user_id}'{_P.end}")
     
     def print_help(self) -> None:
         """Print help information about available commands."""
@@ -302,23 +620,30 @@ class InteractiveMem0CLI:
             "How long should I continue taking it?"
         ]
         
+        # Embed all four prompts in one request up front; each step's search
+        # then reads its query vector from the embedding cache
+        self._embed(demo_messages)
+        
+        # Each turn's memory write overlaps the pause and is awaited before the
+        # next turn searches, so later steps still see what earlier steps stored
         for i, message in enumerate(demo_messages, 1):
             print(f"\n{Colors.WARNING}📋 Demo Step {i}/4{Colors.ENDC}")
             print(f"{Colors.BOLD}👤 Demo User:{Colors.ENDC} {message}")
             
-            response = self.generate_ai_response(message)
-            print(f"{Colors.BOLD}🤖 AI:{Colors.ENDC} {response}")
+            self.generate_ai_response(message)
             
             if i < len(demo_messages):
                 input(f"\n{Colors.OKCYAN}⏸️  Press Enter to continue to next step...{Colors.ENDC}")
         
-        print(f"\n{Colors.OKGREEN}✅ Demo completed! The AI now has memory of the BPC-157 conversation.{Colors.ENDC}")
+        self._wait_for_pending_store()
+        
+        print(f"\n{_P.ok} Demo completed! The AI now has memory of the BPC-157 conversation.{_P.end}")
     
     def show_all_memories(self) -> None:
         """Show all memories for the current user."""
         print(f"\n{Colors.HEADER}📚 All Memories for User: {self.user_id}{Colors.ENDC}")
         
-        memories = self.search_memories("user", limit=50)
+        memories = self._list_memories(limit=50)
         
         if not memories:
             print(f"{Colors.WARNING}No memories found for this user.{Colors.ENDC}")
@@ -327,6 +652,66 @@ class InteractiveMem0CLI:
         for i, memory in enumerate(memories, 1):
             print(f"{Colors.OKBLUE}  {i}.{Colors.ENDC} {memory.get('memory', 'N/A')}")
     
+    def _cmd_help(self, args: str) -> None:
+        """Handle /help."""
+        self.print_help()
+    
+    def _cmd_stats(self, args: str) -> None:
+        """Handle /stats."""
+        stats = self.get_memory_stats()
+        print(f"\n{Colors.HEADER}📊 Session Statistics{Colors.ENDC}")
+        print(f"{Colors.OKBLUE}  Total memories: {stats.get('total_memories', 'N/A')}{Colors.ENDC}")
+        print(f"{Colors.OKBLUE}  Conversations: {stats.get('conversations', 0)}{Colors.ENDC}")
+        print(f"{Colors.OKBLUE}  Current user: {stats.get('user_id', 'N/A')}{Colors.ENDC}")
+        print(f"{Colors.OKBLUE}  Session duration: {stats.get('uptime_formatted', 'N/A')}{Colors.ENDC}")
+    
+    def _cmd_search(self, args: str) -> None:
+        """Handle /search <query>."""
+        if not args:
+            print(f"{_P.err} Please provide a search query. Example: /search BPC-157{_P.end}")
+            return
+            
+        results = self.search_memories(args)
+        if results:
+            print(f"\n{Colors.HEADER}🔍 Found {len(results)} memories for '{args}'{Colors.ENDC}")
+            for i, result in enumerate(results, 1):
+                print(f"{Colors.OKBLUE}  {i}.{Colors.ENDC} {result.get('memory', 'N/A')}")
+        else:
+            print(f"{Colors.WARNING}🔍 No memories found for '{args}'{Colors.ENDC}")
+    
+    def _cmd_user(self, args: str) -> None:
+        """Handle /user [user_id]."""
+        if not args:
+            print(f"{Colors.OKBLUE}Current user ID: {self.user_id}{Colors.ENDC}")
+            print(f"{Colors.OKCYAN}To change user: /user <new_user_id>{Colors.ENDC}")
+            return
+            
+        self.switch_user(args.strip())
+    
+    def _cmd_newuser(self, args: str) -> None:
+        """Handle /newuser."""
+        new_user_id = f"demo_user_{secrets.token_hex(4)}"
+        self.switch_user(new_user_id)
+    
+    def _cmd_memories(self, args: str) -> None:
+        """Handle /memories."""
+        self.show_all_memories()
+    
+    def _cmd_demo(self, args: str) -> None:
+        """Handle /demo."""
+        self.run_peptide_demo()
+    
+    # Slash-command dispatch table, built once at class creation
+    COMMANDS: Dict[str, Callable[["InteractiveMem0CLI", str], None]] = {
+        "help": _cmd_help,
+        "stats": _cmd_stats,
+        "search": _cmd_search,
+        "user": _cmd_user,
+        "newuser": _cmd_newuser,
+        "memories": _cmd_memories,
+        "demo": _cmd_demo,
+    }
+    
     def handle_command(self, user_input: str) -> bool:
         """
         Handle special commands starting with '/'.
@@ -344,51 +729,12 @@ class InteractiveMem0CLI:
         command = parts[0].lower()
         args = parts[1] if len(parts) > 1 else ""
         
-        if command == "help":
-            self.print_help()
-            
-        elif command == "stats":
-            stats = self.get_memory_stats()
-            print(f"\n{Colors.HEADER}📊 Session Statistics{Colors.ENDC}")
-            print(f"{Colors.OKBLUE}  Total memories: {stats.get('total_memories', 'N/A')}{Colors.ENDC}")
-            print(f"{Colors.OKBLUE}  Conversations: {stats.get('conversations', 0)}{Colors.ENDC}")
-            print(f"{Colors.OKBLUE}  Current user: {stats.get('user_id', 'N/A')}{Colors.ENDC}")
-            print(f"{Colors.OKBLUE}  Session duration: {stats.get('uptime_formatted', 'N/A')}{Colors.ENDC}")
-            
-        elif command == "search":
-            if not args:
-                print(f"{Colors.FAIL}❌ Please provide a search query. Example: /search BPC-157{Colors.ENDC}")
-                return True
-                
-            results = self.search_memories(args)
-            if results:
-                print(f"\n{Colors.HEADER}🔍 Found {len(results)} memories for '{args}'{Colors.ENDC}")
-                for i, result in enumerate(results, 1):
-                    print(f"{Colors.OKBLUE}  {i}.{Colors.ENDC} {result.get('memory', 'N/A')}")
-            else:
-                print(f"{Colors.WARNING}🔍 No memories found for '{args}'{Colors.ENDC}")
-                
-        elif command == "user":
-            if not args:
-                print(f"{Colors.OKBLUE}Current user ID: {self.user_id}{Colors.ENDC}")
-                print(f"{Colors.OKCYAN}To change user: /user <new_user_id>{Colors.ENDC}")
-                return True
-                
-            self.switch_user(args.strip())
-            
-        elif command == "newuser":
-            new_user_id = f"demo_user_{uuid.uuid4().hex[:8]}"
-            self.switch_user(new_user_id)
-            
-        elif command == "memories":
-            self.show_all_memories()
-            
-        elif command == "demo":
-            self.run_peptide_demo()
-            
-        else:
-            print(f"{Colors.FAIL}❌ Unknown command: /{command}{Colors.ENDC}")
+        handler = self.COMMANDS.get(command)
+        if handler is None:
+            print(f"{_P.err} Unknown command: /{command}{_P.end}")
             print(f"{Colors.OKCYAN}Type /help for available commands{Colors.ENDC}")
+        else:
+            handler(self, args)
             
         return True
     
@@ -424,25 +770,25 @@ class InteractiveMem0CLI:
                     if self.handle_command(user_input):
                         continue
                     
-                    # Process regular chat message
-                    print(f"{Colors.BOLD}🤖 AI:{Colors.ENDC} ", end="", flush=True)
-                    response = self.generate_ai_response(user_input)
-                    print(response)
+                    # Process regular chat message (the response is streamed as it's generated)
+                    self.generate_ai_response(user_input)
                     
                 except KeyboardInterrupt:
                     print(f"\n\n{Colors.OKGREEN}👋 Session interrupted. Goodbye!{Colors.ENDC}")
                     break
                     
                 except Exception as e:
-                    print(f"{Colors.FAIL}❌ An error occurred: {str(e)}{Colors.ENDC}")
+                    print(f"{_P.err} An error occurred: {str(e)}{_P.end}")
                     print(f"{Colors.OKCYAN}You can continue chatting or type 'exit' to quit.{Colors.ENDC}")
                     
         except Exception as e:
-            print(f"{Colors.FAIL}❌ Fatal error: {str(e)}{Colors.ENDC}")
+            print(f"{_P.err} Fatal error: {str(e)}{_P.end}")
         
         finally:
-            # Print session summary
+            # Print session summary once the last memory write has landed
             stats = self.get_memory_stats()
+            self._store_pool.shutdown(wait=True)
+            self.openai_client.close()
             print(f"\n{Colors.HEADER}📊 Session Summary{Colors.ENDC}")
             print(f"{Colors.OKBLUE}  Conversations: {stats.get('conversations', 0)}{Colors.ENDC}")
             print(f"{Colors.OKBLUE}  Memories stored: {stats.get('total_memories', 'N/A')}{Colors.ENDC}")
@@ -453,6 +799,9 @@ def main():
     try:
         # Parse command line arguments
         user_id = None
+        if len(sys.argv) > 1 and sys.argv[1] in ("-h", "--help"):
+            print("Usage: python scripts/interactive_mem0_qdrant_cli.py [user_id]")
+            return
         if len(sys.argv) > 1:
             user_id = sys.argv[1]
             print(f"{Colors.OKBLUE}Using provided user ID: {user_id}{Colors.ENDC}")
@@ -465,7 +814,7 @@ def main():
         print(f"\n{Colors.OKGREEN}👋 Goodbye!{Colors.ENDC}")
         
     except Exception as e:
-        print(f"{Colors.FAIL}❌ Fatal error: {str(e)}{Colors.ENDC}")
+        print(f"{_P.err} Fatal error: {str(e)}{_P.end}")
         print(f"{Colors.OKCYAN}Please check your environment configuration and try again.{Colors.ENDC}")
         sys.exit(1)
 
@@ -9,24 +9,37 @@ Author: AI Tutor Development Team
 Version: 1.0
 """
 
-import webbrowser
+import functools
 import time
-import requests
 import sys
 
-def check_server_running(url: str, max_retries: int = 5) -> bool:
-    """Check if the server is running and accessible."""
+@functools.lru_cache(maxsize=1)
+def get_session():
+    """Shared keep-alive session so retries and the API info request reuse one connection."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    return session
+
+def check_server_running(url: str, max_retries: int = 8) -> bool:
+    """Check if the server is running and accessible, backing off geometrically."""
+    import requests
+    
+    delay = 0.1
     for i in range(max_retries):
         try:
-            response = requests.get(url, timeout=5)
+            response = get_session().get(url, timeout=1)
             if response.status_code == 200:
                 return True
         except requests.exceptions.RequestException:
             pass
         
         if i < max_retries - 1:
-            print(f"Server not ready, retrying in 2 seconds... ({i+1}/{max_retries})")
-            time.sleep(2)
+            print(f"Server not ready, retrying in {delay:.1f} seconds... ({i+1}/{max_retries})")
+            time.sleep(delay)
+            delay *= 2
     
     return False
 
@@ -50,8 +63,13 @@ def main():
     
     # Get API info
     try:
-        response = requests.get(base_url)
-        api_info = response.json()
+        try:
+            from orjson import loads
+        except ImportError:
+            from json import loads
+        
+        response = get_session().get(base_url)
+        api_info = loads(response.content)
         print(f"📋 API: {api_info['message']} v{api_info['version']}")
         print(f"🌍 Environment: {api_info['environment']}")
         print(f"📊 Status: {api_info['status']}")
@@ -62,6 +80,8 @@ def main():
     
     # Open Swagger UI in browser
     try:
+        import webbrowser
+        
         webbrowser.open(docs_url)
         print("✅ Swagger UI opened in your default browser!")
         
@@ -17,21 +17,105 @@ Author: AI Tutor Development Team
 Version: 1.0
 """
 
-import os
+import functools
 import sys
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 
 # Add the project root to the Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from dotenv import load_dotenv
-from openai import OpenAI
-from mem0 import Memory
+from scripts._memlib import (
+    EMBEDDING_MODEL,
+    OPENAI_API_KEY,
+    PROTOCOL,
+    QDRANT_URL,
+    get_memory,
+    get_openai_client,
+    get_qdrant_client,
+)
+
+COLLECTION_NAME = "mem0_peptide_demo_256"
+# text-embedding-3 models can return shortened embeddings directly; 256 dims
+# keeps nearly all of the retrieval quality at a sixth of the 1536-dim size
+EMBEDDING_DIMS = 256
+
+_SYSTEM_PREFIX = (
+    "You are a knowledgeable AI health coach specializing in peptide therapy. "
+)
+_SYSTEM_INSTRUCTIONS = (
+    "You provide evidence-based information while emphasizing that peptides like BPC-157 "
+    "are not FDA-approved for human use and should only be used under medical supervision. "
+    "Use the provided conversation history to give personalized responses. "
+    "Keep responses concise but informative."
+)
 
-# Load environment variables
-load_dotenv()
+@functools.lru_cache(maxsize=128)
+def _build_system_prompt(memories: Tuple[str, ...]) -> str:
+    """Build the system prompt for a set of retrieved memories."""
+    if not memories:
+        return _SYSTEM_PREFIX.rstrip()
+    memories_str = "\n".join(f"- {memory}" for memory in memories)
+    return f"{_SYSTEM_PREFIX}{_SYSTEM_INSTRUCTIONS}\n\nRelevant conversation history:\n{memories_str}"
+
+class _SemanticCache:
+    """
+    LRU cache of AI responses keyed by query embedding.
+    
+    A lookup returns the cached response whose query has the highest cosine
+    similarity to the new one, provided it clears the threshold. Embeddings
+    are normalized on insert into one preallocated float32 matrix, so a
+    lookup is a single matrix-vector product. Each response is tagged with
+    the memory version it was generated against and only matches lookups
+    for that same version.
+    """
+    
+    def __init__(self, dim: int, capacity: int = 512, threshold: float = 0.87):
+        self.threshold = threshold
+        self._matrix = np.empty((capacity, dim), dtype=np.float32)
+        self._versions = np.zeros(capacity, dtype=np.int64)
+        self._responses: List[Optional[str]] = [None] * capacity
+        self._size = 0
+        # Slot indices ordered from least to most recently used
+        self._lru: "OrderedDict[int, None]" = OrderedDict()
+    
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+    
+    def get(self, embedding: List[float], version: int) -> Optional[str]:
+        """Return the closest response cached for this memory version, or None on a miss."""
+        if not self._size:
+            return None
+        
+        sims = self._matrix[:self._size] @ self._normalize(embedding)
+        sims[self._versions[:self._size] != version] = -np.inf
+        best = int(np.argmax(sims))
+        if sims[best] <= self.threshold:
+            return None
+        
+        self._lru.move_to_end(best)
+        return self._responses[best]
+    
+    def put(self, embedding: List[float], response: str, version: int) -> None:
+        """Cache a response, overwriting the least recently used slot when full."""
+        if self._size < len(self._responses):
+            slot = self._size
+            self._size += 1
+        else:
+            slot, _ = self._lru.popitem(last=False)
+        
+        self._matrix[slot] = self._normalize(embedding)
+        self._versions[slot] = version
+        self._responses[slot] = response
+        self._lru[slot] = None
 
 class PeptideCoachingDemo:
     """Demo class for peptide coaching scenario."""
@@ -41,104 +125,184 @@ class PeptideCoachingDemo:
         print("🧬 Initializing Peptide Coaching Demo...")
         
         # Validate environment
-        if not os.getenv("OPENAI_API_KEY"):
+        if not OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
         
-        if not os.getenv("QDRANT_URL"):
+        if not QDRANT_URL:
             raise ValueError("QDRANT_URL not found in environment variables")
         
         # Configure Mem0 with Qdrant using custom client approach
-        from qdrant_client import QdrantClient
-        
-        qdrant_url = os.getenv("QDRANT_URL")
-        qdrant_use_https = os.getenv("QDRANT_USE_HTTPS", "true").lower() == "true"
-        protocol = "https" if qdrant_use_https else "http"
-        
-        # Create Qdrant client with proper timeout settings for Railway
-        qdrant_client = QdrantClient(
-            url=f"{protocol}://{qdrant_url}",
-            port=None,
-            timeout=30,
-            prefer_grpc=False
-        )
-        
-        self.config = {
-            "llm": {
-                "provider": "openai",
-                "config": {
-                    "model": "gpt-4o-mini",
-                    "temperature": 0.7,
-                    "max_tokens": 1000
-                }
-            },
-            "vector_store": {
-                "provider": "qdrant",
-                "config": {
-                    "collection_name": "mem0_peptide_demo",
-                    "client": qdrant_client,
-                    "embedding_model_dims": 1536,
-                    "on_disk": False
-                }
-            }
-        }
+        from qdrant_client import models
         
-        # Initialize components
-        self.memory = Memory.from_config(self.config)
-        self.openai_client = OpenAI()
+        self.qdrant_client = get_qdrant_client()
+        self.memory = get_memory(COLLECTION_NAME, EMBEDDING_DIMS)
+        self.openai_client = get_openai_client()
         self.user_id = "demo_user_bpc157"
+        self.response_cache = _SemanticCache(EMBEDDING_DIMS)
+        self._user_filter = models.Filter(must=[
+            models.FieldCondition(key="user_id", match=models.MatchValue(value=self.user_id))
+        ])
         
-        print(f"✅ Connected to Qdrant at {protocol}://{qdrant_url}")
-        print(f"✅ Using collection: mem0_peptide_demo")
+        # Two-stage search: score candidates on the in-RAM int8 vectors, then
+        # rerank 4x the requested limit against the full-precision originals
+        self._search_params = models.SearchParams(
+            quantization=models.QuantizationSearchParams(ignore=False, rescore=True, oversampling=4.0)
+        )
+        
+        # Memory writes run on one background worker so they stay in order
+        self._store_pool = ThreadPoolExecutor(max_workers=1)
+        self._pending_store: Optional[Future] = None
+        # Bumped each time a write changes a memory, so cached responses go stale
+        self._memory_version = 0
+        
+        print(f"✅ Connected to Qdrant at {PROTOCOL}://{QDRANT_URL}")
+        print(f"✅ Using collection: {COLLECTION_NAME}")
         print(f"✅ Demo user ID: {self.user_id}")
     
-    def generate_response(self, user_message: str) -> str:
-        """Generate AI response with memory context."""
-        print(f"\n🔍 Searching memories for: '{user_message[:30]}...'")
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts in a single API request."""
+        response = self.openai_client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=texts,
+            dimensions=EMBEDDING_DIMS
+        )
+        return [item.embedding for item in response.data]
+    
+    def _wait_for_pending_store(self) -> None:
+        """Block until the last background memory write has finished."""
+        if self._pending_store is not None:
+            try:
+                result = self._pending_store.result()
+            except Exception as e:
+                print(f"⚠️  Storing the previous conversation failed: {str(e)}")
+                # A failed add may still have changed some memories
+                changed = True
+            else:
+                # Mem0 lists an ADD/UPDATE/DELETE event per memory it changed;
+                # turns that yield no new facts leave cached responses valid
+                changed = any(
+                    entry.get("event", "NONE") != "NONE"
+                    for entry in (result or {}).get("results", [])
+                )
+            self._pending_store = None
+            if changed:
+                self._memory_version += 1
+    
+    def close(self) -> None:
+        """Finish any outstanding memory write and stop the background worker."""
+        self._wait_for_pending_store()
+        self._store_pool.shutdown(wait=True)
+    
+    @staticmethod
+    def _to_memories(points) -> List[Dict[str, Any]]:
+        """Convert Qdrant points to Mem0-style search results."""
+        return [
+            {"id": point.id, "memory": point.payload.get("data"), "score": point.score}
+            for point in points
+        ]
+    
+    def _search_memories(self, query_embedding: List[float], limit: int) -> List[Dict[str, Any]]:
+        """Search the user's memories directly in Qdrant with a precomputed embedding."""
+        points = self.qdrant_client.query_points(
+            collection_name=COLLECTION_NAME,
+            query=query_embedding,
+            query_filter=self._user_filter,
+            limit=limit,
+            search_params=self._search_params,
+            with_payload=["data"]
+        ).points
+        return self._to_memories(points)
+    
+    def _search_memories_batch(self, query_embeddings: List[List[float]], limits: List[int]) -> List[List[Dict[str, Any]]]:
+        """Run several user-scoped searches, each with its own limit, in a single Qdrant request."""
+        from qdrant_client import models
         
-        # Search for relevant memories
-        relevant_memories = self.memory.search(
-            query=user_message,
-            user_id=self.user_id,
-            limit=5
+        responses = self.qdrant_client.query_batch_points(
+            collection_name=COLLECTION_NAME,
+            requests=[
+                models.QueryRequest(
+                    query=embedding,
+                    filter=self._user_filter,
+                    params=self._search_params,
+                    limit=limit,
+                    with_payload=["data"]
+                )
+                for embedding, limit in zip(query_embeddings, limits)
+            ]
         )
+        return [self._to_memories(response.points) for response in responses]
+    
+    def generate_response(
+        self,
+        user_message: str,
+        query_embedding: Optional[List[float]] = None,
+        memories_list: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        """
+        Generate AI response with memory context.
+        
+        A precomputed query embedding and/or memory search result can be
+        passed in to skip those round-trips.
+        """
+        if query_embedding is None:
+            query_embedding = self._embed([user_message])[0]
+        
+        # Near-duplicate prompts reuse the earlier answer, as long as no memory
+        # has changed since; the previous turn's write has to land first
+        # so the version (and the search below) reflect it
+        self._wait_for_pending_store()
+        memory_version = self._memory_version
+        cached_response = self.response_cache.get(query_embedding, memory_version)
+        if cached_response is not None:
+            print("\n⚡ Reusing response to a near-identical earlier message")
+            print(f"🤖 AI: {cached_response}")
+            return cached_response
         
-        memories_list = relevant_memories.get("results", [])
-        memories_str = "\n".join(f"- {entry['memory']}" for entry in memories_list)
+        print(f"\n🔍 Searching memories for: '{user_message[:30]}...'")
+        
+        # Search for relevant memories, reusing the query embedding
+        if memories_list is None:
+            memories_list = self._search_memories(query_embedding, limit=5)
         
         print(f"📚 Found {len(memories_list)} relevant memories")
         
-        # Construct system prompt
-        system_prompt = (
-            "You are a knowledgeable AI health coach specializing in peptide therapy. "
-            "You provide evidence-based information while emphasizing that peptides like BPC-157 "
-            "are not FDA-approved for human use and should only be used under medical supervision. "
-            "Use the provided conversation history to give personalized responses. "
-            "Keep responses concise but informative."
-            f"\n\nRelevant conversation history:\n{memories_str}" if memories_str 
-            else "You are a knowledgeable AI health coach specializing in peptide therapy."
-        )
+        # Construct system prompt; repeated memory sets reuse the built string
+        system_prompt = _build_system_prompt(tuple(entry['memory'] for entry in memories_list))
         
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_message}
         ]
         
-        # Generate response
-        print("🤖 Generating AI response...")
-        response = self.openai_client.chat.completions.create(
+        # Generate response, printing tokens as they arrive
+        stream = self.openai_client.chat.completions.create(
             model="gpt-4o-mini",
             messages=messages,
             temperature=0.7,
-            max_tokens=1000
+            max_tokens=1000,
+            stream=True
         )
         
-        assistant_response = response.choices[0].message.content
+        print("🤖 AI: ", end="", flush=True)
+        parts = []
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                sys.stdout.write(delta)
+                sys.stdout.flush()
+                parts.append(delta)
+        print()
+        assistant_response = "".join(parts)
         
-        # Store conversation in memory
+        # Store conversation in memory in the background; the response is
+        # returned straight away
         conversation_messages = messages + [{"role": "assistant", "content": assistant_response}]
-        self.memory.add(conversation_messages, user_id=self.user_id)
-        print("💾 Conversation stored in Qdrant")
+        self._pending_store = self._store_pool.submit(
+            self.memory.add, conversation_messages, user_id=self.user_id
+        )
+        print("💾 Storing conversation in Qdrant")
         
+        self.response_cache.put(query_embedding, assistant_response, memory_version)
         return assistant_response
     
     def run_demo_scenario(self):
@@ -178,6 +342,10 @@ class PeptideCoachingDemo:
             }
         ]
         
+        # Embed every scenario prompt in one request
+        for scenario, embedding in zip(scenarios, self._embed([s["user_input"] for s in scenarios])):
+            scenario["embedding"] = embedding
+        
         for scenario in scenarios:
             print(f"\n📋 STEP {scenario['step']}: {scenario['description']}")
             print(f"Expected: {scenario['expected']}")
@@ -185,10 +353,8 @@ class PeptideCoachingDemo:
             
             print(f"👤 User: {scenario['user_input']}")
             
-            # Generate response
-            response = self.generate_response(scenario['user_input'])
-            
-            print(f"🤖 AI: {response}")
+            # Generate response (printed as it streams)
+            self.generate_response(scenario['user_input'], scenario['embedding'])
             
             # Pause between steps
             if scenario['step'] < len(scenarios):
@@ -206,14 +372,13 @@ class PeptideCoachingDemo:
         print("\n🔍 MEMORY VERIFICATION")
         print("-" * 30)
         
-        # Search for BPC-157 related memories
-        search_results = self.memory.search(
-            query="BPC-157 peptide dosage",
-            user_id=self.user_id,
-            limit=10
-        )
-        
-        memories = search_results.get("results", [])
+        # Embed and search for the BPC-157 check and the recall prompt together;
+        # the recall response reuses its search result instead of searching again,
+        # so it uses the same limit generate_response would search with
+        recall_prompt = "Remind me about my peptide usage"
+        self._wait_for_pending_store()
+        embeddings = self._embed(["BPC-157 peptide dosage", recall_prompt])
+        memories, recall_memories = self._search_memories_batch(embeddings, limits=[10, 5])
         
         print(f"📊 Total memories stored: {len(memories)}")
         
@@ -224,8 +389,7 @@ class PeptideCoachingDemo:
         
         # Test memory recall
         print("\n🧠 Testing memory recall...")
-        recall_response = self.generate_response("Remind me about my peptide usage")
-        print(f"🤖 Recall test: {recall_response[:150]}...")
+        self.generate_response(recall_prompt, embeddings[1], recall_memories)
         
         print("\n✅ Memory verification complete!")
     
@@ -251,8 +415,7 @@ class PeptideCoachingDemo:
                 if not user_input:
                     continue
                 
-                response = self.generate_response(user_input)
-                print(f"🤖 AI: {response}")
+                self.generate_response(user_input)
                 
             except KeyboardInterrupt:
                 print("\n👋 Goodbye!")
@@ -265,16 +428,19 @@ def main():
     try:
         demo = PeptideCoachingDemo()
         
-        # Check command line arguments
-        if len(sys.argv) > 1 and sys.argv[1] == "--interactive":
-            demo.interactive_mode()
-        else:
-            demo.run_demo_scenario()
-            
-            # Ask if user wants to continue in interactive mode
-            choice = input("\n🎮 Would you like to continue in interactive mode? (y/n): ")
-            if choice.lower().startswith('y'):
+        try:
+            # Check command line arguments
+            if len(sys.argv) > 1 and sys.argv[1] == "--interactive":
                 demo.interactive_mode()
+            else:
+                demo.run_demo_scenario()
+                
+                # Ask if user wants to continue in interactive mode
+                choice = input("\n🎮 Would you like to continue in interactive mode? (y/n): ")
+                if choice.lower().startswith('y'):
+                    demo.interactive_mode()
+        finally:
+            demo.close()
     
     except Exception as e:
         print(f"❌ Demo failed: {str(e)}")
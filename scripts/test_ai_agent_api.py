@@ -9,49 +9,83 @@ Author: AI Tutor Development Team
 Version: 1.0
 """
 
-import requests
-import json
+import asyncio
 import time
-import uuid
 
-def test_api_endpoints():
-    """Test the AI Agent API endpoints."""
-    
-    base_url = "http://localhost:8000/api/v1"
+import httpx
+
+try:
+    from orjson import dumps, loads
+except ImportError:
+    from json import dumps, loads
+
+async def _run_api_checks(base_url: str):
+    """Run the API checks against a running server."""
     
     print("🤖 Testing AI Agent Mem0 API")
     print("=" * 50)
     
-    # Test health endpoints
-    print("\n1. Testing Health Endpoints")
-    print("-" * 30)
-    
-    try:
-        # Basic health check
-        response = requests.get(f"{base_url}/health")
-        print(f"Basic Health: {response.status_code}")
-        if response.status_code == 200:
-            print(f"Status: {response.json()['status']}")
+    # One pooled client for every request; four keep-alive connections cover
+    # the concurrent checks below and are then reused by the chat turns
+    limits = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+    headers = {"Content-Type": "application/json"}
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits, headers=headers) as client:
+        # The health and error-handling checks don't depend on each other or on
+        # the chat flow, so they are all sent at once up front
+        try:
+            health, detailed, invalid, empty_user = await asyncio.gather(
+                client.get("/health"),
+                client.get("/health/detailed"),
+                client.post("/chat", content=dumps({"message": "Test without user_id"})),
+                client.post("/chat", content=dumps({"user_id": "", "message": "Test with empty user_id"})),
+            )
+        except httpx.ConnectError:
+            print("❌ Cannot connect to API. Make sure the server is running:")
+            print("   uvicorn app.main:app --reload")
+            return
         
-        # Detailed health check
-        response = requests.get(f"{base_url}/health/detailed")
-        print(f"Detailed Health: {response.status_code}")
-        if response.status_code == 200:
-            health_data = response.json()
+        # Test health endpoints
+        print("\n1. Testing Health Endpoints")
+        print("-" * 30)
+        
+        print(f"Basic Health: {health.status_code}")
+        if health.status_code == 200:
+            print(f"Status: {loads(health.content)['status']}")
+        
+        print(f"Detailed Health: {detailed.status_code}")
+        if detailed.status_code == 200:
+            health_data = loads(detailed.content)
             print(f"Overall Status: {health_data['status']}")
             for service, info in health_data['services'].items():
                 print(f"  {service}: {info['status']}")
+        
+        await _check_chat(client)
+        
+        # Test error handling
+        print("\n4. Testing Error Handling")
+        print("-" * 30)
+        
+        print(f"Invalid request status: {invalid.status_code}")
+        if invalid.status_code == 422:
+            print("✅ Validation error handling working")
+        
+        print(f"Empty user_id status: {empty_user.status_code}")
+        if empty_user.status_code == 400:
+            print("✅ Empty user_id error handling working")
     
-    except requests.exceptions.ConnectionError:
-        print("❌ Cannot connect to API. Make sure the server is running:")
-        print("   uvicorn app.main:app --reload")
-        return
+    print("\n" + "=" * 50)
+    print("🎉 API testing completed!")
+
+async def _check_chat(client: httpx.AsyncClient):
+    """Exercise the chat endpoint, then check the follow-up sees the first turn."""
     
     # Test chat endpoint
     print("\n2. Testing Chat Endpoint")
     print("-" * 30)
     
-    test_user_id = f"test_user_{uuid.uuid4().hex[:8]}"
+    # Wall-clock nanoseconds keep IDs unique across runs against the same
+    # Qdrant collection, so stale memories never leak into a new run
+    test_user_id = f"test_user_{time.time_ns():x}"
     
     # First conversation
     chat_request = {
@@ -68,14 +102,14 @@ def test_api_endpoints():
     
     try:
         start_time = time.time()
-        response = requests.post(f"{base_url}/chat", json=chat_request)
+        response = await client.post("/chat", content=dumps(chat_request))
         end_time = time.time()
         
         print(f"Status Code: {response.status_code}")
         print(f"Response Time: {(end_time - start_time):.2f}s")
         
         if response.status_code == 200:
-            data = response.json()
+            data = loads(response.content)
             print(f"Memories Found: {data['memories_found']}")
             print(f"Memories Created: {data['memories_created']}")
             print(f"API Response Time: {data['response_time_ms']}ms")
@@ -91,9 +125,9 @@ def test_api_endpoints():
                 "metadata": {"domain": "peptide_coaching"}
             }
             
-            response2 = requests.post(f"{base_url}/chat", json=second_request)
+            response2 = await client.post("/chat", content=dumps(second_request))
             if response2.status_code == 200:
-                data2 = response2.json()
+                data2 = loads(response2.content)
                 print(f"Memories Found: {data2['memories_found']}")
                 print(f"AI Response: {data2['response'][:100]}...")
                 
@@ -107,29 +141,10 @@ def test_api_endpoints():
     
     except Exception as e:
         print(f"❌ Error testing chat endpoint: {str(e)}")
-    
-    # Test error handling
-    print("\n4. Testing Error Handling")
-    print("-" * 30)
-    
-    # Test invalid request
-    invalid_request = {"message": "Test without user_id"}
-    response = requests.post(f"{base_url}/chat", json=invalid_request)
-    print(f"Invalid request status: {response.status_code}")
-    
-    if response.status_code == 422:
-        print("✅ Validation error handling working")
-    
-    # Test empty user_id
-    empty_user_request = {"user_id": "", "message": "Test with empty user_id"}
-    response = requests.post(f"{base_url}/chat", json=empty_user_request)
-    print(f"Empty user_id status: {response.status_code}")
-    
-    if response.status_code == 400:
-        print("✅ Empty user_id error handling working")
-    
-    print("\n" + "=" * 50)
-    print("🎉 API testing completed!")
+
+def test_api_endpoints():
+    """Test the AI Agent API endpoints."""
+    asyncio.run(_run_api_checks("http://localhost:8000/api/v1"))
 
 if __name__ == "__main__":
     test_api_endpoints() 
\ No newline at end of file
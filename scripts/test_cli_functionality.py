@@ -3,22 +3,21 @@
 Test script to verify CLI functionality works correctly.
 """
 
-import os
 import sys
-import uuid
+import time
 from pathlib import Path
 
 # Add the project root to the Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from dotenv import load_dotenv
-from openai import OpenAI
-from mem0 import Memory
-from qdrant_client import QdrantClient
-
-# Load environment variables
-load_dotenv()
+from scripts._memlib import (
+    OPENAI_API_KEY,
+    QDRANT_URL,
+    get_memory,
+    get_openai_client,
+    get_qdrant_client,
+)
 
 def test_cli_components():
     """Test that all CLI components can be initialized."""
@@ -27,63 +26,33 @@ def test_cli_components():
     
     # Test 1: Environment validation
     print("1. Testing environment validation...")
-    if not os.getenv("OPENAI_API_KEY"):
+    if not OPENAI_API_KEY:
         print("❌ OPENAI_API_KEY not found")
         return False
-    if not os.getenv("QDRANT_URL"):
+    if not QDRANT_URL:
         print("❌ QDRANT_URL not found")
         return False
     print("✅ Environment validation passed")
     
     # Test 2: Qdrant client initialization
     print("2. Testing Qdrant client...")
-    qdrant_url = os.getenv("QDRANT_URL")
-    qdrant_use_https = os.getenv("QDRANT_USE_HTTPS", "true").lower() == "true"
-    protocol = "https" if qdrant_use_https else "http"
-    
-    qdrant_client = QdrantClient(
-        url=f"{protocol}://{qdrant_url}",
-        port=None,
-        timeout=30,
-        prefer_grpc=False
-    )
-    
+    qdrant_client = get_qdrant_client()
     collections = qdrant_client.get_collections()
     print(f"✅ Qdrant client works: {len(collections.collections)} collections")
     
     # Test 3: Mem0 memory initialization
     print("3. Testing Mem0 memory...")
-    config = {
-        "llm": {
-            "provider": "openai",
-            "config": {
-                "model": "gpt-4o-mini",
-                "temperature": 0.7,
-                "max_tokens": 1000
-            }
-        },
-        "vector_store": {
-            "provider": "qdrant",
-            "config": {
-                "collection_name": "mem0_cli_test",
-                "client": qdrant_client,
-                "embedding_model_dims": 1536,
-                "on_disk": False
-            }
-        }
-    }
-    
-    memory = Memory.from_config(config)
+    memory = get_memory("mem0_cli_test")
     print("✅ Mem0 memory initialized")
     
     # Test 4: OpenAI client
     print("4. Testing OpenAI client...")
-    openai_client = OpenAI()
+    openai_client = get_openai_client()
     print("✅ OpenAI client initialized")
     
     # Test 5: Basic memory operations
     print("5. Testing memory operations...")
-    test_user_id = f"cli_test_{uuid.uuid4().hex[:8]}"
+    test_user_id = f"cli_test_{time.time_ns():x}"
     
     # Add a memory
     test_message = f"Test message from CLI test user {test_user_id}"
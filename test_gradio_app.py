@@ -2,15 +2,36 @@
 """
 Test script for the Gradio AI Tutor application
 Tests basic functionality and memory isolation
+
+Pass --fast to skip the import test when it already passed within the last
+day against the same installed packages.
 """
 
+import importlib.util
 import sys
 import os
-from pathlib import Path
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# The tutor app is loaded straight from its file under a distinct module name,
+# so it neither goes on sys.path nor clashes with other apps named "app"
+gradio_app_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gradio-ai-tutor", "app.py")
 
-# Add gradio-ai-tutor to path
-gradio_app_path = str(Path(__file__).parent / "gradio-ai-tutor")
-sys.path.insert(0, gradio_app_path)
+# Records the installed-packages fingerprint of the last passing import test
+TEST_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".test_cache")
+TEST_CACHE_MAX_AGE = 24 * 60 * 60
+
+# (phone number, expected validity) pairs for test_user_validation
+PHONE_CASES = (
+    ("1234567890", True),
+    ("+1234567890", True),
+    ("(123) 456-7890", True),
+    ("123-456-7890", True),
+    ("123", False),
+    ("abc", False),
+    ("", False),
+    ("12345", False),
+)
 
 def test_imports():
     """Test that all required modules can be imported."""
@@ -26,14 +47,13 @@ def test_imports():
         from openai import OpenAI
         print("✅ OpenAI imported successfully")
         
-        from mem0 import Memory
-        print("✅ Mem0 imported successfully")
-        
-        from qdrant_client import QdrantClient
-        print("✅ Qdrant client imported successfully")
-        
-        import phonenumbers
-        print("✅ phonenumbers imported successfully")
+        # These are only checked for presence: mem0 and qdrant_client are
+        # imported in full by the app tests, and phonenumbers loads large
+        # metadata tables that nothing in the app needs at import
+        for module_name, label in (("mem0", "Mem0"), ("qdrant_client", "Qdrant client"), ("phonenumbers", "phonenumbers")):
+            if importlib.util.find_spec(module_name) is None:
+                raise ImportError(f"No module named '{module_name}'")
+            print(f"✅ {label} is installed")
         
         from pydantic import BaseModel, Field, ValidationError
         print("✅ Pydantic imported successfully")
@@ -44,6 +64,23 @@ def test_imports():
         print(f"❌ Import error: {e}")
         return False
 
+def env_fingerprint() -> str:
+    """Hash the names and versions of all installed packages."""
+    import hashlib
+    from importlib.metadata import distributions
+    
+    packages = sorted(f"{dist.metadata['Name']}=={dist.version}" for dist in distributions())
+    return hashlib.sha256(",".join(packages).encode()).hexdigest()
+
+def imports_verified(fingerprint: str) -> bool:
+    """Whether the import test passed recently against the same packages."""
+    try:
+        with open(TEST_CACHE_FILE) as f:
+            cached_fingerprint, timestamp = f.read().split()
+        return cached_fingerprint == fingerprint and time.time() - float(timestamp) < TEST_CACHE_MAX_AGE
+    except (OSError, ValueError):
+        return False
+
 def test_environment():
     """Test environment variables."""
     print("\n🔧 Testing environment...")
@@ -63,14 +100,32 @@ def test_environment():
     print(f"✅ QDRANT_URL: {qdrant_url}")
     return True
 
-def test_app_initialization():
+def import_app():
+    """Import the Gradio app as gradio_app, or return None if it fails."""
+    if "gradio_app" in sys.modules:
+        return sys.modules["gradio_app"]
+    
+    spec = importlib.util.spec_from_file_location("gradio_app", gradio_app_file)
+    gradio_app = importlib.util.module_from_spec(spec)
+    sys.modules["gradio_app"] = gradio_app
+    try:
+        spec.loader.exec_module(gradio_app)
+    except Exception as e:
+        # Don't leave a half-initialized module cached for later imports
+        sys.modules.pop("gradio_app", None)
+        print(f"❌ App import error: {e}")
+        return None
+    return gradio_app
+
+def test_app_initialization(app=None):
     """Test that the app can be initialized."""
     print("\n🚀 Testing app initialization...")
     
     try:
-        # Change to gradio app directory and import
-        os.chdir(gradio_app_path)
-        import app
+        if app is None:
+            app = import_app()
+            if app is None:
+                return False
         
         # Test service initialization
         if app.services_initialized:
@@ -91,43 +146,29 @@ def test_app_initialization():
         print(f"❌ App initialization error: {e}")
         return False
 
-def test_user_validation():
+def test_user_validation(app=None):
     """Test user validation functions."""
     print("\n👤 Testing user validation...")
     
     try:
-        # Make sure we're in the right directory
-        os.chdir(gradio_app_path)
-        import app
-        
-        # Test phone number validation
-        valid_phones = [
-            "1234567890",
-            "+1234567890", 
-            "(123) 456-7890",
-            "123-456-7890"
-        ]
-        
-        invalid_phones = [
-            "123",
-            "abc",
-            "",
-            "12345"
-        ]
-        
-        for phone in valid_phones:
-            if app.validate_phone_number(phone):
-                print(f"✅ Valid phone: {phone}")
-            else:
-                print(f"❌ Should be valid: {phone}")
+        if app is None:
+            app = import_app()
+            if app is None:
                 return False
         
-        for phone in invalid_phones:
-            if not app.validate_phone_number(phone):
-                print(f"✅ Invalid phone rejected: {phone}")
-            else:
-                print(f"❌ Should be invalid: {phone}")
-                return False
+        # Test phone number validation; results are written as one block
+        validate_phone_number = app.validate_phone_number
+        lines = []
+        failed = False
+        for phone, expected in PHONE_CASES:
+            if validate_phone_number(phone) is not expected:
+                lines.append(f"❌ Should be {'valid' if expected else 'invalid'}: {phone}")
+                failed = True
+                break
+            lines.append(f"✅ {'Valid phone' if expected else 'Invalid phone rejected'}: {phone}")
+        sys.stdout.write("\n".join(lines) + "\n")
+        if failed:
+            return False
         
         # Test user session creation
         user_id, message = app.create_user_session("testuser", "1234567890")
@@ -144,41 +185,63 @@ def test_user_validation():
         print(f"❌ User validation error: {e}")
         return False
 
-def main():
-    """Run all tests."""
+def main(fast: bool = False):
+    """Run all tests; in fast mode, skip the import test if it is cached."""
     print("🧪 AI Tutor Gradio App Test Suite")
     print("=" * 40)
     
-    # Store original directory
-    original_dir = os.getcwd()
-    
     tests = [
         ("Import Test", test_imports),
         ("Environment Test", test_environment),
         ("App Initialization Test", test_app_initialization),
         ("User Validation Test", test_user_validation),
     ]
+    app_tests = (test_app_initialization, test_user_validation)
+    
+    fingerprint = env_fingerprint() if fast else None
+    if fast and imports_verified(fingerprint):
+        print("⏭️  Skipping Import Test (passed recently with the same packages)")
+        tests = [test for test in tests if test[1] is not test_imports]
     
     passed = 0
     total = len(tests)
     
+    # Importing the app (SDK imports plus Qdrant/Mem0 setup) is the slowest
+    # step, so it runs in the background while the quick tests run. It only
+    # starts once the import test is done: importing the same packages from
+    # two threads at once can deadlock or expose half-initialized modules
+    executor = ThreadPoolExecutor(max_workers=1)
+    app_future = None
+    
     try:
         for test_name, test_func in tests:
+            if app_future is None and test_func is not test_imports:
+                app_future = executor.submit(import_app)
+            
             print(f"\n📋 Running: {test_name}")
             print("-" * 30)
             
             try:
-                if test_func():
+                # The app tests share one import of the app module
+                if test_func in app_tests:
+                    app = app_future.result()
+                    result = app is not None and test_func(app)
+                else:
+                    result = test_func()
+                
+                if result:
                     print(f"✅ {test_name} PASSED")
                     passed += 1
+                    if fast and test_func is test_imports:
+                        with open(TEST_CACHE_FILE, "w") as f:
+                            f.write(f"{fingerprint} {time.time()}")
                 else:
                     print(f"❌ {test_name} FAILED")
             except Exception as e:
                 print(f"❌ {test_name} ERROR: {e}")
     
     finally:
-        # Restore original directory
-        os.chdir(original_dir)
+        executor.shutdown()
     
     print("\n" + "=" * 40)
     print(f"📊 Test Results: {passed}/{total} tests passed")
@@ -196,5 +259,5 @@ def main():
         return False
 
 if __name__ == "__main__":
-    success = main()
+    success = main(fast="--fast" in sys.argv[1:])
     sys.exit(0 if success else 1) 
\ No newline at end of file
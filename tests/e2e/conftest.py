@@ -0,0 +1,82 @@
+"""
+Pytest Configuration for End-to-End Tests
+
+Provides the OpenAI client and Mem0 Memory shared by the end-to-end tests.
+They are session-scoped so the clients and Mem0's embedder, vector store
+and LLM are set up once per pytest run rather than once per test class.
+"""
+
+import os
+import functools
+import pytest
+import allure
+from dotenv import load_dotenv
+from openai import OpenAI
+from mem0 import Memory
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_environment():
+    """Set up environment variables and validate prerequisites."""
+    with allure.step("Load environment variables"):
+        load_dotenv()
+
+    with allure.step("Validate required environment variables"):
+        openai_api_key = os.getenv("OPENAI_API_KEY")
+
+        allure.attach(
+            f"OPENAI_API_KEY present: {'Yes' if openai_api_key else 'No'}",
+            name="Environment Configuration",
+            attachment_type=allure.attachment_type.TEXT
+        )
+
+        assert openai_api_key is not None, "OPENAI_API_KEY environment variable is required"
+
+@pytest.fixture(scope="session")
+def openai_client(setup_environment):
+    """Create OpenAI client for conversation generation."""
+    with allure.step("Initialize OpenAI client"):
+        client = OpenAI()
+        return client
+
+@pytest.fixture(scope="session")
+def memory_instance(setup_environment):
+    """Create and configure mem0 Memory instance with in-memory storage."""
+    with allure.step("Initialize Memory layer with in-memory storage"):
+        config = {
+            "llm": {
+                "provider": "openai",
+                "config": {
+                    "model": "gpt-4o-mini",
+                    "temperature": 0.7,
+                    "max_tokens": 1000
+                }
+            }
+            # No vector_store config means in-memory storage is used
+        }
+
+        allure.attach(
+            str(config),
+            name="Memory Configuration",
+            attachment_type=allure.attachment_type.JSON
+        )
+
+        try:
+            memory = Memory.from_config(config)
+            # Queries such as "what are my food preferences?" repeat across
+            # tests and users; embeddings are deterministic, so reuse them
+            memory.embedding_model.embed = functools.lru_cache(maxsize=256)(
+                memory.embedding_model.embed
+            )
+            allure.attach(
+                "✅ Memory layer initialized with in-memory storage successfully",
+                name="Memory Initialization",
+                attachment_type=allure.attachment_type.TEXT
+            )
+            return memory
+        except Exception as e:
+            allure.attach(
+                f"❌ Failed to initialize memory: {str(e)}",
+                name="Memory Initialization Error",
+                attachment_type=allure.attachment_type.TEXT
+            )
+            pytest.fail(f"Failed to initialize Memory: {str(e)}")
@@ -16,14 +16,12 @@ The test uses in-memory storage for simplicity and focuses on the
 core memory functionality rather than external database integration.
 """
 
-import os
 import pytest
 import allure
+import threading
 import time
-from typing import Dict, List, Any, Optional
-from dotenv import load_dotenv
-from openai import OpenAI
-from mem0 import Memory
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any
 
 
 @allure.epic("End-to-End Testing")
@@ -36,68 +34,6 @@ class TestMem0ConversationFlow:
     that memory functionality works correctly in an automated environment.
     """
 
-    @pytest.fixture(scope="class", autouse=True)
-    def setup_environment(self):
-        """Set up environment variables and validate prerequisites."""
-        with allure.step("Load environment variables"):
-            load_dotenv()
-            
-        with allure.step("Validate required environment variables"):
-            openai_api_key = os.getenv("OPENAI_API_KEY")
-            
-            allure.attach(
-                f"OPENAI_API_KEY present: {'Yes' if openai_api_key else 'No'}",
-                name="Environment Configuration",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            
-            assert openai_api_key is not None, "OPENAI_API_KEY environment variable is required"
-
-    @pytest.fixture(scope="class")
-    def openai_client(self, setup_environment):
-        """Create OpenAI client for conversation generation."""
-        with allure.step("Initialize OpenAI client"):
-            client = OpenAI()
-            return client
-
-    @pytest.fixture(scope="class")
-    def memory_instance(self, setup_environment):
-        """Create and configure mem0 Memory instance with in-memory storage."""
-        with allure.step("Initialize Memory layer with in-memory storage"):
-            config = {
-                "llm": {
-                    "provider": "openai",
-                    "config": {
-                        "model": "gpt-4o-mini",
-                        "temperature": 0.7,
-                        "max_tokens": 1000
-                    }
-                }
-                # No vector_store config means in-memory storage is used
-            }
-            
-            allure.attach(
-                str(config),
-                name="Memory Configuration",
-                attachment_type=allure.attachment_type.JSON
-            )
-            
-            try:
-                memory = Memory.from_config(config)
-                allure.attach(
-                    "✅ Memory layer initialized with in-memory storage successfully",
-                    name="Memory Initialization",
-                    attachment_type=allure.attachment_type.TEXT
-                )
-                return memory
-            except Exception as e:
-                allure.attach(
-                    f"❌ Failed to initialize memory: {str(e)}",
-                    name="Memory Initialization Error",
-                    attachment_type=allure.attachment_type.TEXT
-                )
-                pytest.fail(f"Failed to initialize Memory: {str(e)}")
-
     @pytest.fixture(scope="class")
     def conversation_handler(self, openai_client, memory_instance):
         """Create a conversation handler that mimics the CLI functionality."""
@@ -107,21 +43,29 @@ class TestMem0ConversationFlow:
                 self.memory = memory_instance
                 self.model_name = "gpt-4o-mini"
                 self.conversation_count = 0
-                self.start_time = time.time()
+                self.start_time = time.perf_counter()
+                # Tests may chat from several threads at once
+                self._count_lock = threading.Lock()
+                # The embedded local Qdrant store is not thread-safe, so every
+                # Memory call is serialized; only the OpenAI calls overlap
+                self._memory_lock = threading.Lock()
             
             def chat_with_memories(self, message: str, user_id: str) -> Dict[str, Any]:
                 """Process a chat message using Mem0 memory enhancement."""
-                start_time = time.time()
+                # Intervals are measured in integer nanoseconds on the monotonic
+                # performance counter and reported in seconds
+                start_time = time.perf_counter_ns()
                 
                 try:
                     # Step 1: Retrieve relevant memories
-                    memory_search_start = time.time()
-                    relevant_memories = self.memory.search(
-                        query=message, 
-                        user_id=user_id, 
-                        limit=3
-                    )
-                    memory_search_time = time.time() - memory_search_start
+                    with self._memory_lock:
+                        memory_search_start = time.perf_counter_ns()
+                        relevant_memories = self.memory.search(
+                            query=message, 
+                            user_id=user_id, 
+                            limit=3
+                        )
+                    memory_search_time = time.perf_counter_ns() - memory_search_start
                     
                     # Step 2: Format memories for inclusion in the prompt
                     memories_list = relevant_memories.get("results", [])
@@ -143,34 +87,36 @@ class TestMem0ConversationFlow:
                     ]
                     
                     # Step 5: Generate response using OpenAI
-                    response_start = time.time()
+                    response_start = time.perf_counter_ns()
                     response = self.openai_client.chat.completions.create(
                         model=self.model_name,
                         messages=messages,
                         temperature=0.7,
                         max_tokens=1000
                     )
-                    response_time = time.time() - response_start
+                    response_time = time.perf_counter_ns() - response_start
                     assistant_response = response.choices[0].message.content
                     
                     # Step 6: Store the conversation in memory
-                    memory_store_start = time.time()
                     conversation_messages = messages + [{"role": "assistant", "content": assistant_response}]
-                    self.memory.add(conversation_messages, user_id=user_id)
-                    memory_store_time = time.time() - memory_store_start
+                    with self._memory_lock:
+                        memory_store_start = time.perf_counter_ns()
+                        self.memory.add(conversation_messages, user_id=user_id)
+                    memory_store_time = time.perf_counter_ns() - memory_store_start
                     
-                    self.conversation_count += 1
-                    total_time = time.time() - start_time
+                    with self._count_lock:
+                        self.conversation_count += 1
+                    total_time = time.perf_counter_ns() - start_time
                     
                     return {
                         "response": assistant_response,
                         "memories_found": len(memories_list),
                         "memories_context": memories_str,
                         "timing": {
-                            "total": total_time,
-                            "memory_search": memory_search_time,
-                            "response_generation": response_time,
-                            "memory_storage": memory_store_time
+                            "total": total_time / 1e9,
+                            "memory_search": memory_search_time / 1e9,
+                            "response_generation": response_time / 1e9,
+                            "memory_storage": memory_store_time / 1e9
                         }
                     }
                     
@@ -180,17 +126,18 @@ class TestMem0ConversationFlow:
                         "error": str(e),
                         "memories_found": 0,
                         "memories_context": "",
-                        "timing": {"total": time.time() - start_time}
+                        "timing": {"total": (time.perf_counter_ns() - start_time) / 1e9}
                     }
             
             def search_memories(self, query: str, user_id: str, limit: int = 5) -> List[Dict[str, Any]]:
                 """Search memories for a specific query."""
                 try:
-                    search_results = self.memory.search(
-                        query=query, 
-                        user_id=user_id, 
-                        limit=limit
-                    )
+                    with self._memory_lock:
+                        search_results = self.memory.search(
+                            query=query, 
+                            user_id=user_id, 
+                            limit=limit
+                        )
                     return search_results.get("results", [])
                 except Exception as e:
                     return []
@@ -198,20 +145,23 @@ class TestMem0ConversationFlow:
             def get_memory_stats(self, user_id: str) -> Dict[str, Any]:
                 """Get statistics about current memory usage."""
                 try:
-                    # Search for all memories for this user
-                    all_memories = self.memory.search(query="", user_id=user_id, limit=1000)
+                    # List the user's memories directly; a search would embed a
+                    # query and run a vector search just to count them
+                    with self._memory_lock:
+                        all_memories = self.memory.get_all(user_id=user_id, limit=1000)
                     memory_count = len(all_memories.get("results", []))
                     
                     return {
                         "total_memories": memory_count,
                         "user_id": user_id,
                         "conversations": self.conversation_count,
-                        "uptime_seconds": time.time() - self.start_time
+                        "uptime_seconds": time.perf_counter() - self.start_time
                     }
                 except Exception as e:
                     return {"error": str(e)}
         
-        return ConversationHandler(openai_client, memory_instance)
+        handler = ConversationHandler(openai_client, memory_instance)
+        return handler
 
     @allure.story("Initial Conversation Without Memory")
     @allure.severity(allure.severity_level.CRITICAL)
@@ -370,10 +320,16 @@ class TestMem0ConversationFlow:
         user_id = "e2e_test_user_001"
         search_queries = ["cheese", "preferences", "food"]
         
-        for query in search_queries:
+        # The three searches are issued concurrently; the handler serializes
+        # their Memory access, so this also exercises that locking
+        with ThreadPoolExecutor(max_workers=len(search_queries)) as executor:
+            all_results = list(executor.map(
+                lambda query: conversation_handler.search_memories(query, user_id, limit=5),
+                search_queries
+            ))
+        
+        for query, results in zip(search_queries, all_results):
             with allure.step(f"Search memories for: '{query}'"):
-                results = conversation_handler.search_memories(query, user_id, limit=5)
-                
                 allure.attach(
                     f"Query: {query}\nResults found: {len(results)}\nResults: {results}",
                     name=f"Memory Search - {query}",
@@ -449,11 +405,17 @@ class TestMem0ConversationFlow:
             
             assert 'error' not in result, f"No errors should occur: {result.get('error', '')}"
         
+        # The two queries are independent, so their OpenAI round trips run
+        # concurrently; the handler serializes their Memory access
+        message = "what are my food preferences?"
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result1, result2 = executor.map(
+                lambda user_id: conversation_handler.chat_with_memories(message, user_id),
+                (user1_id, user2_id)
+            )
+        
         with allure.step("Query preferences for user 1"):
             # Query preferences for user 1 (should get cheese preferences)
-            message = "what are my food preferences?"
-            result1 = conversation_handler.chat_with_memories(message, user1_id)
-            
             allure.attach(
                 f"User 1 Query: {message}\nAI: {result1['response']}",
                 name="User 1 Preference Query",
@@ -462,9 +424,6 @@ class TestMem0ConversationFlow:
         
         with allure.step("Query preferences for user 2"):
             # Query preferences for user 2 (should get spicy food preferences)
-            message = "what are my food preferences?"
-            result2 = conversation_handler.chat_with_memories(message, user2_id)
-            
             allure.attach(
                 f"User 2 Query: {message}\nAI: {result2['response']}",
                 name="User 2 Preference Query",
@@ -508,10 +467,16 @@ class TestMem0ConversationFlow:
             "🎉🚀💻🧠🔥",  # Emoji only
         ]
         
-        for i, message in enumerate(edge_cases):
+        # The edge cases are independent, so their OpenAI round trips run
+        # concurrently; the handler serializes their Memory access
+        with ThreadPoolExecutor(max_workers=len(edge_cases)) as executor:
+            results = list(executor.map(
+                lambda message: conversation_handler.chat_with_memories(message, user_id),
+                edge_cases
+            ))
+        
+        for i, (message, result) in enumerate(zip(edge_cases, results)):
             with allure.step(f"Test edge case {i+1}: '{message[:50]}...'"):
-                result = conversation_handler.chat_with_memories(message, user_id)
-                
                 allure.attach(
                     f"Input: '{message[:100]}...'\nResponse: {result['response'][:200]}...",
                     name=f"Edge Case {i+1}",
@@ -0,0 +1,100 @@
+"""
+Unit tests for the semantic response cache in scripts/run_peptide_coaching_demo.py.
+
+OpenAI, Qdrant and Mem0 are replaced by in-process fakes, so these tests need
+the demo's dependencies installed but no API keys or running services.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import allure
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("mem0")
+pytest.importorskip("qdrant_client")
+
+from scripts.run_peptide_coaching_demo import PeptideCoachingDemo, _SemanticCache
+
+PROMPT = "What peptide am I using?"
+NEAR_DUPLICATE = "what peptide am i using"
+PROMPT_EMBEDDING = [1.0, 0.0, 0.0, 0.0]
+NEAR_DUPLICATE_EMBEDDING = [0.98, 0.1, 0.05, 0.0]
+
+
+class FakeCompletions:
+    """Streams a fixed answer and counts how often the model is called."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        delta = SimpleNamespace(content=f"answer {self.calls}")
+        return [SimpleNamespace(choices=[SimpleNamespace(delta=delta)])]
+
+
+class FakeMemory:
+    """Records adds and returns the Mem0 result configured for the test."""
+
+    def __init__(self, add_result):
+        self.add_result = add_result
+        self.adds = 0
+
+    def add(self, messages, user_id):
+        self.adds += 1
+        return self.add_result
+
+
+def make_demo(add_result):
+    """Build a demo wired to fakes, skipping the real service setup."""
+    demo = PeptideCoachingDemo.__new__(PeptideCoachingDemo)
+    demo.user_id = "test_user"
+    demo.response_cache = _SemanticCache(dim=len(PROMPT_EMBEDDING))
+    demo.memory = FakeMemory(add_result)
+    demo.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+    demo._search_memories = lambda query_embedding, limit: []
+    demo._store_pool = ThreadPoolExecutor(max_workers=1)
+    demo._pending_store = None
+    demo._memory_version = 0
+    return demo
+
+
+@allure.feature("Peptide Coaching Demo")
+@allure.story("Semantic Response Cache")
+def test_near_duplicate_prompt_is_served_from_cache():
+    """A turn that stores no new facts keeps the previous answer reusable."""
+    demo = make_demo({"results": []})
+    try:
+        with allure.step("Answer the original prompt"):
+            first = demo.generate_response(PROMPT, PROMPT_EMBEDDING, [])
+
+        with allure.step("Ask a near-duplicate of the prompt"):
+            second = demo.generate_response(NEAR_DUPLICATE, NEAR_DUPLICATE_EMBEDDING, [])
+
+        with allure.step("Verify the cached answer was reused"):
+            assert second == first
+            assert demo.openai_client.chat.completions.calls == 1
+            assert demo.memory.adds == 1
+    finally:
+        demo.close()
+
+
+@allure.feature("Peptide Coaching Demo")
+@allure.story("Semantic Response Cache")
+def test_changed_memories_invalidate_cache():
+    """A turn whose write changes a memory forces a fresh answer."""
+    demo = make_demo({"results": [{"id": "1", "memory": "Uses BPC-157", "event": "ADD"}]})
+    try:
+        with allure.step("Answer the original prompt"):
+            first = demo.generate_response(PROMPT, PROMPT_EMBEDDING, [])
+
+        with allure.step("Ask a near-duplicate after the memories changed"):
+            second = demo.generate_response(NEAR_DUPLICATE, NEAR_DUPLICATE_EMBEDDING, [])
+
+        with allure.step("Verify the model was called again"):
+            assert second != first
+            assert demo.openai_client.chat.completions.calls == 2
+    finally:
+        demo.close()